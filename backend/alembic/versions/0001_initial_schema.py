@@ -0,0 +1,85 @@
+"""Initial schema
+
+Baseline: the users and entries tables as the original
+``Base.metadata.create_all`` created them. Databases created that way
+should be stamped instead of upgraded:
+
+    alembic stamp 0001
+
+Tables and columns added later have their own revisions, which skip
+what a later create_all at startup may already have created.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+MOODS = ("HAPPY", "SAD", "NEUTRAL", "ANGRY", "EXCITED", "ANXIOUS", "PEACEFUL", "GRATEFUL", "TIRED", "CONFUSED")
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("username", sa.String(100), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255)),
+        sa.Column("avatar_url", sa.String(500)),
+        sa.Column("bio", sa.Text()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("is_premium", sa.Boolean()),
+        sa.Column("is_verified", sa.Boolean()),
+        sa.Column("language", sa.String(10)),
+        sa.Column("timezone", sa.String(50)),
+        sa.Column("theme", sa.String(20)),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("last_login_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "entries",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("video_url", sa.String(500)),
+        sa.Column("video_key", sa.String(255)),
+        sa.Column("thumbnail_url", sa.String(500)),
+        sa.Column("duration_seconds", sa.Float()),
+        sa.Column("file_size_bytes", sa.Integer()),
+        sa.Column("mime_type", sa.String(50)),
+        sa.Column("transcript", sa.Text()),
+        sa.Column("summary", sa.Text()),
+        sa.Column("auto_tags", sa.JSON()),
+        sa.Column("sentiment_score", sa.Float()),
+        sa.Column("title", sa.String(255)),
+        sa.Column("note", sa.Text()),
+        sa.Column("mood", sa.Enum(*MOODS, name="moodtype")),
+        sa.Column("mood_intensity", sa.Integer()),
+        sa.Column("manual_tags", sa.JSON()),
+        sa.Column("is_private", sa.Boolean()),
+        sa.Column("is_favorite", sa.Boolean()),
+        sa.Column("is_processed", sa.Boolean()),
+        sa.Column("location", sa.String(255)),
+        sa.Column("weather", sa.String(50)),
+        sa.Column("recorded_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_entries_id", "entries", ["id"])
+
+
+def downgrade():
+    op.drop_table("entries")
+    op.drop_table("users")
+    sa.Enum(name="moodtype").drop(op.get_bind(), checkfirst=True)
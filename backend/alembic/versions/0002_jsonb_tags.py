@@ -0,0 +1,46 @@
+"""JSONB tag columns with GIN indexes
+
+``json`` has no ``@>`` operator and can't be indexed, so tag filtering
+scanned every entry of the user. ``jsonb_path_ops`` GIN indexes serve the
+``manual_tags @> '["tag"]'`` containment filters of the entry list.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TAG_COLUMNS = ("manual_tags", "auto_tags")
+
+
+def upgrade():
+    for column in TAG_COLUMNS:
+        op.alter_column(
+            "entries", column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f"{column}::jsonb"
+        )
+        op.create_index(
+            f"ix_entries_{column}_gin", "entries", [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "jsonb_path_ops"},
+            # create_all made them on databases created at this revision
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    for column in TAG_COLUMNS:
+        op.drop_index(f"ix_entries_{column}_gin", table_name="entries")
+        op.alter_column(
+            "entries", column,
+            type_=sa.JSON(),
+            postgresql_using=f"{column}::json"
+        )
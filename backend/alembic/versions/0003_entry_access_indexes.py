@@ -0,0 +1,55 @@
+"""Indexes for per-user entry access patterns
+
+Every endpoint filters entries by user_id; these cover the listing order
+(and keyset pagination), the favorites, mood and on-this-day filters.
+Built CONCURRENTLY so existing tables stay writable during the upgrade.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_entries_user_recorded", "entries",
+            ["user_id", sa.text("recorded_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_entries_user_favorite", "entries", ["user_id"],
+            postgresql_where=sa.text("is_favorite"),
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_entries_user_mood", "entries", ["user_id", "mood"],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_entries_user_month_day", "entries",
+            [
+                "user_id",
+                sa.text("(EXTRACT(month FROM recorded_at))"),
+                sa.text("(EXTRACT(day FROM recorded_at))"),
+            ],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in (
+            "ix_entries_user_month_day",
+            "ix_entries_user_mood",
+            "ix_entries_user_favorite",
+            "ix_entries_user_recorded",
+        ):
+            op.drop_index(name, table_name="entries", postgresql_concurrently=True)
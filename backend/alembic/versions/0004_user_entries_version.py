@@ -0,0 +1,28 @@
+"""Per-user entries change counter
+
+``users.entries_version`` is bumped in the same transaction as every
+change to a user's entries. ETags and cached analytics responses are
+keyed on it.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("entries_version", sa.Integer(), server_default="0", nullable=False)
+    )
+
+
+def downgrade():
+    op.drop_column("users", "entries_version")
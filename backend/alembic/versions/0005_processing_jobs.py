@@ -0,0 +1,47 @@
+"""Processing job queue
+
+Durable queue of video processing jobs, claimed by workers with
+``SELECT ... FOR UPDATE SKIP LOCKED``. Skipped if ``create_all`` already
+created the table at startup.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+JOB_STATUSES = ("PENDING", "RUNNING", "DONE", "FAILED")
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("processing_jobs"):
+        return
+
+    op.create_table(
+        "processing_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entry_id", sa.Integer(), sa.ForeignKey("entries.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("stage", sa.String(50), nullable=False),
+        sa.Column("status", sa.Enum(*JOB_STATUSES, name="jobstatus"), nullable=False),
+        sa.Column("attempts", sa.Integer()),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("run_after", sa.DateTime()),
+        sa.Column("locked_until", sa.DateTime()),
+        sa.Column("locked_by", sa.String(255)),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_processing_jobs_id", "processing_jobs", ["id"])
+    op.create_index("ix_processing_jobs_entry_id", "processing_jobs", ["entry_id"])
+    op.create_index("ix_processing_jobs_status", "processing_jobs", ["status"])
+
+
+def downgrade():
+    op.drop_table("processing_jobs")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
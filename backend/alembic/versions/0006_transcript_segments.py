@@ -0,0 +1,40 @@
+"""Transcript segments
+
+Timed segments persisted per transcription chunk, so a restarted job
+resumes after the last committed chunk. Skipped if ``create_all``
+already created the table at startup.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("transcript_segments"):
+        return
+
+    op.create_table(
+        "transcript_segments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entry_id", sa.Integer(), sa.ForeignKey("entries.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("start_seconds", sa.Float(), nullable=False),
+        sa.Column("end_seconds", sa.Float(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("chunk_end_seconds", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.UniqueConstraint("entry_id", "start_seconds", name="uq_transcript_segments_entry_start"),
+    )
+    op.create_index("ix_transcript_segments_id", "transcript_segments", ["id"])
+    op.create_index("ix_transcript_segments_entry_id", "transcript_segments", ["entry_id"])
+
+
+def downgrade():
+    op.drop_table("transcript_segments")
@@ -0,0 +1,42 @@
+"""Daily mood rollup
+
+One row per user and day with entry count, duration and mood
+aggregates, read by the analytics endpoints. Skipped if ``create_all``
+already created the table at startup.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("daily_mood_stats"):
+        return
+
+    op.create_table(
+        "daily_mood_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.Column("duration_seconds", sa.Float(), nullable=False),
+        sa.Column("mood_counts", sa.JSON()),
+        sa.Column("intensity_sums", sa.JSON()),
+        sa.Column("dominant_mood", sa.String(20)),
+        sa.Column("dominant_intensity", sa.Integer()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.UniqueConstraint("user_id", "date", name="uq_daily_mood_stats_user_date"),
+    )
+    op.create_index("ix_daily_mood_stats_id", "daily_mood_stats", ["id"])
+
+
+def downgrade():
+    op.drop_table("daily_mood_stats")
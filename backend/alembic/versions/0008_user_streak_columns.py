@@ -0,0 +1,33 @@
+"""User streak columns
+
+``current_streak``, ``longest_streak`` and ``last_entry_date`` on users,
+maintained incrementally on entry writes. ``create_all`` never adds
+columns to an existing table, but databases it created from scratch
+already have them, hence IF NOT EXISTS.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+COLUMNS = {
+    "current_streak": "INTEGER",
+    "longest_streak": "INTEGER",
+    "last_entry_date": "DATE",
+}
+
+
+def upgrade():
+    for name, type_ in COLUMNS.items():
+        op.execute(f"ALTER TABLE users ADD COLUMN IF NOT EXISTS {name} {type_}")
+
+
+def downgrade():
+    for name in reversed(list(COLUMNS)):
+        op.drop_column("users", name)
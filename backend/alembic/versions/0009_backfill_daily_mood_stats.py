@@ -0,0 +1,33 @@
+"""Backfill the daily mood rollup
+
+The rollup was only maintained for entries written after it was added,
+so days recorded earlier were missing from analytics. Rebuilds it from
+the entries, like ``python -m app.cli rebuild-mood-stats``.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+from sqlalchemy.orm import Session
+
+from app.services.mood_stats import rebuild_daily_mood_stats
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Joins the migration's transaction; its commit doesn't end it
+    session = Session(bind=op.get_bind())
+    try:
+        rebuild_daily_mood_stats(session)
+    finally:
+        session.close()
+
+
+def downgrade():
+    # The rows stay valid; 0007's downgrade drops the table
+    pass
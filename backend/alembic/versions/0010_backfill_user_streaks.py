@@ -0,0 +1,34 @@
+"""Backfill the user streak columns
+
+The streak columns were only updated when entries were written after
+they were added, so existing users showed no streak. Recomputes them
+from the rollup backfilled in 0009, like ``python -m app.cli
+repair-streaks``.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+from sqlalchemy.orm import Session
+
+from app.services.streaks import repair_streaks
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Joins the migration's transaction; its commits don't end it
+    session = Session(bind=op.get_bind())
+    try:
+        repair_streaks(session)
+    finally:
+        session.close()
+
+
+def downgrade():
+    # The values stay valid; 0008's downgrade drops the columns
+    pass
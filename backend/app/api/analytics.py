@@ -1,102 +1,92 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, case
-from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, extract, select, cast, case, true, union_all, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 from app.database import get_db
 from app.models.entry import Entry, MoodType
 from app.models.user import User
+from app.models.mood_stat import DailyMoodStat
 from app.schemas.entry import EntryStats
+from app.services.streaks import live_streak
+from app.services.cache import cached_response
 from app.utils.security import get_current_active_user
+from app.utils.etag import UserDataETag, cache_control_max_age
+from app.config import settings
 
 router = APIRouter(prefix="/analytics", tags=["Analitik"])
 
+# Charts may be reused for ANALYTICS_MAX_AGE_SECONDS; totals and streaks
+# revalidate on every request
+CHART_CACHE_CONTROL = cache_control_max_age(settings.ANALYTICS_MAX_AGE_SECONDS)
 
-@router.get("/stats", response_model=EntryStats)
+
+@router.get("/stats", response_model=EntryStats, dependencies=[Depends(UserDataETag("stats", daily=True))])
+@cached_response("stats")
 async def get_stats(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Kullanıcının genel istatistiklerini getir."""
-    now = datetime.utcnow()
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
-    # Total entries
-    total_entries = db.query(Entry).filter(Entry.user_id == current_user.id).count()
-    
-    # Total duration
-    total_duration = db.query(func.sum(Entry.duration_seconds)).filter(
-        Entry.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Entries this week
-    entries_this_week = db.query(Entry).filter(
-        Entry.user_id == current_user.id,
-        Entry.recorded_at >= week_ago
-    ).count()
-    
-    # Entries this month
-    entries_this_month = db.query(Entry).filter(
-        Entry.user_id == current_user.id,
-        Entry.recorded_at >= month_ago
-    ).count()
-    
-    # Mood distribution
-    mood_counts = db.query(
-        Entry.mood, func.count(Entry.id)
-    ).filter(
-        Entry.user_id == current_user.id,
-        Entry.mood.isnot(None)
-    ).group_by(Entry.mood).all()
-    
-    mood_distribution = {mood.value: count for mood, count in mood_counts if mood}
+    """
+    Kullanıcının genel istatistiklerini getir.
     
-    # Calculate streak
-    streak_days = await calculate_streak(current_user.id, db)
+    "Bu hafta" ve "bu ay" bugün dahil son 7 ve 30 takvim gününü (UTC)
+    kapsar; saat bazında kayan bir pencere değildir. Böylece sonuç gün
+    boyunca değişmez ve önbellek/ETag günlük olarak yenilenir.
+    """
+    now = datetime.utcnow()
+    # Whole UTC days from the rollup: today and the 6 (29) days before it
+    week_start = now.date() - timedelta(days=6)
+    month_start = now.date() - timedelta(days=29)
+    
+    # Totals, mood distribution and the streaks kept on the user record
+    # in a single round-trip
+    row = (await db.execute(select(
+        func.coalesce(func.sum(DailyMoodStat.entry_count), 0).label("total_entries"),
+        func.coalesce(func.sum(DailyMoodStat.duration_seconds), 0).label("total_duration"),
+        func.coalesce(func.sum(DailyMoodStat.entry_count).filter(DailyMoodStat.date >= week_start), 0).label("this_week"),
+        func.coalesce(func.sum(DailyMoodStat.entry_count).filter(DailyMoodStat.date >= month_start), 0).label("this_month"),
+        mood_distribution_subquery(current_user.id).label("mood_distribution"),
+        User.current_streak,
+        User.longest_streak,
+        User.last_entry_date
+    ).select_from(User).outerjoin(
+        DailyMoodStat, DailyMoodStat.user_id == User.id
+    ).where(
+        User.id == current_user.id
+    ).group_by(User.id))).one()
     
     return EntryStats(
-        total_entries=total_entries,
-        total_duration_minutes=total_duration / 60,
-        mood_distribution=mood_distribution,
-        entries_this_week=entries_this_week,
-        entries_this_month=entries_this_month,
-        streak_days=streak_days
+        total_entries=row.total_entries,
+        total_duration_minutes=row.total_duration / 60,
+        mood_distribution=row.mood_distribution or {},
+        entries_this_week=row.this_week,
+        entries_this_month=row.this_month,
+        streak_days=live_streak(row, now.date()),
+        longest_streak=row.longest_streak or 0
     )
 
 
-async def calculate_streak(user_id: int, db: Session) -> int:
-    """Calculate consecutive days with entries."""
-    entries = db.query(func.date(Entry.recorded_at)).filter(
-        Entry.user_id == user_id
-    ).distinct().order_by(func.date(Entry.recorded_at).desc()).all()
-    
-    if not entries:
-        return 0
-    
-    dates = [e[0] for e in entries]
-    today = datetime.utcnow().date()
-    
-    # Check if there's an entry today or yesterday
-    if dates[0] != today and dates[0] != today - timedelta(days=1):
-        return 0
-    
-    streak = 1
-    for i in range(1, len(dates)):
-        if dates[i-1] - dates[i] == timedelta(days=1):
-            streak += 1
-        else:
-            break
-    
-    return streak
+def mood_distribution_subquery(user_id: int):
+    """Scalar subquery summing the per-day mood counts into one JSON object."""
+    moods = func.json_each_text(DailyMoodStat.mood_counts).table_valued("key", "value").lateral()
+    totals = select(
+        moods.c.key,
+        func.sum(cast(moods.c.value, Integer)).label("count")
+    ).select_from(DailyMoodStat).join(moods, true()).where(
+        DailyMoodStat.user_id == user_id
+    ).group_by(moods.c.key).subquery()
+    return select(func.json_object_agg(totals.c.key, totals.c.count)).scalar_subquery()
 
 
-@router.get("/mood-heatmap")
+@router.get("/mood-heatmap", dependencies=[Depends(UserDataETag("mood-heatmap", CHART_CACHE_CONTROL, daily=True))])
+@cached_response("mood-heatmap")
 async def get_mood_heatmap(
     year: Optional[int] = None,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     365 günlük duygu ısı haritası verisi.
@@ -106,145 +96,143 @@ async def get_mood_heatmap(
     if not year:
         year = datetime.now().year
     
-    entries = db.query(
-        func.date(Entry.recorded_at).label("date"),
-        Entry.mood,
-        Entry.mood_intensity
-    ).filter(
-        Entry.user_id == current_user.id,
-        extract("year", Entry.recorded_at) == year,
-        Entry.mood.isnot(None)
-    ).all()
-    
-    # Group by date and get dominant mood
-    date_moods = {}
-    for date, mood, intensity in entries:
-        date_str = date.isoformat()
-        if date_str not in date_moods:
-            date_moods[date_str] = []
-        date_moods[date_str].append((mood.value, intensity or 5))
-    
-    # Get dominant mood for each day
-    result = {}
-    for date, moods in date_moods.items():
-        # Sort by intensity and take the most intense mood
-        dominant = max(moods, key=lambda x: x[1])
-        result[date] = {
-            "mood": dominant[0],
-            "intensity": dominant[1],
-            "count": len(moods)
+    days = (await db.execute(select(DailyMoodStat).where(
+        DailyMoodStat.user_id == current_user.id,
+        DailyMoodStat.date >= date(year, 1, 1),
+        DailyMoodStat.date <= date(year, 12, 31),
+        DailyMoodStat.dominant_mood.isnot(None)
+    ))).scalars().all()
+    
+    # Dominant mood (most intense entry) is precomputed per day
+    return {
+        day.date.isoformat(): {
+            "mood": day.dominant_mood,
+            "intensity": day.dominant_intensity,
+            "count": day.mood_entry_count
         }
-    
-    return result
+        for day in days
+    }
 
 
-@router.get("/mood-trends")
+@router.get("/mood-trends", dependencies=[Depends(UserDataETag("mood-trends", CHART_CACHE_CONTROL, daily=True))])
+@cached_response("mood-trends")
 async def get_mood_trends(
     days: int = Query(30, ge=7, le=365),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Belirli süre içindeki duygu trendleri.
     
     Haftalık veya günlük bazda duygu dağılımı.
     """
-    start_date = datetime.utcnow() - timedelta(days=days)
+    start_date = (datetime.utcnow() - timedelta(days=days)).date()
     
-    entries = db.query(
-        func.date(Entry.recorded_at).label("date"),
-        Entry.mood,
-        func.count(Entry.id).label("count")
-    ).filter(
-        Entry.user_id == current_user.id,
-        Entry.recorded_at >= start_date,
-        Entry.mood.isnot(None)
-    ).group_by(
-        func.date(Entry.recorded_at),
-        Entry.mood
-    ).order_by(func.date(Entry.recorded_at)).all()
+    stats = (await db.execute(select(
+        DailyMoodStat.date,
+        DailyMoodStat.mood_counts
+    ).where(
+        DailyMoodStat.user_id == current_user.id,
+        DailyMoodStat.date >= start_date,
+        DailyMoodStat.dominant_mood.isnot(None)
+    ).order_by(DailyMoodStat.date))).all()
     
     # Format for chart
-    result = {}
-    for date, mood, count in entries:
-        date_str = date.isoformat()
-        if date_str not in result:
-            result[date_str] = {}
-        result[date_str][mood.value] = count
-    
-    return result
+    return {day.isoformat(): dict(mood_counts) for day, mood_counts in stats}
 
 
-@router.get("/day-of-week")
+@router.get("/day-of-week", dependencies=[Depends(UserDataETag("day-of-week", CHART_CACHE_CONTROL))])
+@cached_response("day-of-week")
 async def get_day_of_week_analysis(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Haftanın günlerine göre duygu analizi.
     
     Örn: "Cuma günleri %30 daha mutlu"
     """
-    results = db.query(
-        extract("dow", Entry.recorded_at).label("day_of_week"),
-        Entry.mood,
-        func.count(Entry.id).label("count"),
-        func.avg(Entry.mood_intensity).label("avg_intensity")
-    ).filter(
-        Entry.user_id == current_user.id,
-        Entry.mood.isnot(None)
-    ).group_by(
-        "day_of_week",
-        Entry.mood
-    ).all()
+    stats = (await db.execute(select(
+        DailyMoodStat.date,
+        DailyMoodStat.mood_counts,
+        DailyMoodStat.intensity_sums
+    ).where(
+        DailyMoodStat.user_id == current_user.id,
+        DailyMoodStat.dominant_mood.isnot(None)
+    ))).all()
+    
+    # Sum counts and intensities per weekday and mood
+    days = ["Pazar", "Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi"]
+    totals = {day: {} for day in days}
+    for day, mood_counts, intensity_sums in stats:
+        # date.weekday() starts on Monday, the list on Sunday
+        day_totals = totals[days[(day.weekday() + 1) % 7]]
+        for mood, count in mood_counts.items():
+            mood_count, mood_sum = day_totals.get(mood, (0, 0))
+            day_totals[mood] = (mood_count + count, mood_sum + intensity_sums.get(mood, 0))
     
     # Format results
-    days = ["Pazar", "Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi"]
     day_data = {day: {} for day in days}
-    
-    for dow, mood, count, avg_intensity in results:
-        day_name = days[int(dow)]
-        day_data[day_name][mood.value] = {
-            "count": count,
-            "avg_intensity": float(avg_intensity) if avg_intensity else 0
-        }
+    for day_name, moods in totals.items():
+        for mood, (count, intensity_sum) in moods.items():
+            day_data[day_name][mood] = {
+                "count": count,
+                "avg_intensity": intensity_sum / count if count else 0
+            }
     
     return day_data
 
 
-@router.get("/tags")
+def _unnest_tags(column, user_id: int):
+    """Select (mood, tag) for every element of a JSONB tag array column."""
+    tags = func.jsonb_array_elements_text(
+        case((func.jsonb_typeof(column) == "array", column), else_=cast("[]", JSONB))
+    ).table_valued("value").lateral()
+    return select(Entry.mood.label("mood"), tags.c.value.label("tag")).join(tags, true()).where(
+        Entry.user_id == user_id
+    )
+
+
+@router.get("/tags", dependencies=[Depends(UserDataETag("tags", CHART_CACHE_CONTROL))])
+@cached_response("tags")
 async def get_tag_analysis(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """En çok kullanılan etiketler ve ilişkili duygular."""
-    entries = db.query(Entry).filter(
-        Entry.user_id == current_user.id
-    ).all()
+    # One row per (entry, tag) from both tag lists, unnested in the database
+    entry_tags = union_all(
+        _unnest_tags(Entry.manual_tags, current_user.id),
+        _unnest_tags(Entry.auto_tags, current_user.id)
+    ).cte("entry_tags")
+    
+    # Top 20 tags by count
+    top = select(
+        entry_tags.c.tag,
+        func.count().label("total")
+    ).group_by(entry_tags.c.tag).order_by(func.count().desc(), entry_tags.c.tag).limit(20).subquery()
+    
+    rows = (await db.execute(
+        select(top.c.tag, top.c.total, entry_tags.c.mood, func.count())
+        .join(entry_tags, entry_tags.c.tag == top.c.tag)
+        .group_by(top.c.tag, top.c.total, entry_tags.c.mood)
+        .order_by(top.c.total.desc(), top.c.tag)
+    )).all()
     
     tag_stats = {}
+    for tag, total, mood, count in rows:
+        stats = tag_stats.setdefault(tag, {"count": total, "moods": {}})
+        if mood:
+            stats["moods"][mood.value] = count
     
-    for entry in entries:
-        all_tags = (entry.manual_tags or []) + (entry.auto_tags or [])
-        for tag in all_tags:
-            if tag not in tag_stats:
-                tag_stats[tag] = {"count": 0, "moods": {}}
-            tag_stats[tag]["count"] += 1
-            
-            if entry.mood:
-                mood_val = entry.mood.value
-                tag_stats[tag]["moods"][mood_val] = tag_stats[tag]["moods"].get(mood_val, 0) + 1
-    
-    # Sort by count
-    sorted_tags = sorted(tag_stats.items(), key=lambda x: x[1]["count"], reverse=True)[:20]
-    
-    return dict(sorted_tags)
+    return tag_stats
 
 
-@router.get("/on-this-day")
+@router.get("/on-this-day", dependencies=[Depends(UserDataETag("on-this-day", CHART_CACHE_CONTROL, daily=True))])
+@cached_response("on-this-day")
 async def get_on_this_day(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     'Geçen yıl bugün' tarzı anılar.
@@ -253,12 +241,12 @@ async def get_on_this_day(
     """
     today = datetime.utcnow()
     
-    entries = db.query(Entry).filter(
+    entries = (await db.execute(select(Entry).where(
         Entry.user_id == current_user.id,
         extract("month", Entry.recorded_at) == today.month,
         extract("day", Entry.recorded_at) == today.day,
         extract("year", Entry.recorded_at) < today.year
-    ).order_by(Entry.recorded_at.desc()).all()
+    ).order_by(Entry.recorded_at.desc()))).scalars().all()
     
     return [
         {
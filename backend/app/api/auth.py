@@ -1,22 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, UserUpdate
 from app.utils.security import (
-    verify_password, get_password_hash, create_access_token,
+    verify_password_async, get_password_hash_async, create_access_token,
     get_current_user, get_current_active_user
 )
 from app.config import settings
+from app.services.cache import UserCache
 
 router = APIRouter(prefix="/auth", tags=["Kimlik Doğrulama"])
 
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Yeni kullanıcı kaydı oluştur.
     
@@ -25,14 +27,14 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     - **password**: En az 8 karakter şifre
     """
     # Check if email exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    if await db.scalar(select(User.id).where(User.email == user_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Bu e-posta adresi zaten kullanımda"
         )
     
     # Check if username exists
-    if db.query(User).filter(User.username == user_data.username).first():
+    if await db.scalar(select(User.id).where(User.username == user_data.username)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Bu kullanıcı adı zaten kullanımda"
@@ -42,34 +44,35 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     user = User(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash_async(user_data.password),
         full_name=user_data.full_name
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     # Create token
     access_token = create_access_token(
-        data={"sub": user.id, "email": user.email}
+        # python-jose rejects non-string subjects when decoding
+        data={"sub": str(user.id), "email": user.email}
     )
     
     return Token(access_token=access_token, user=UserResponse.from_orm(user))
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Kullanıcı girişi yap ve JWT token al.
     
     OAuth2 uyumlu form verisi kullanır.
     """
     # Find user by email or username
-    user = db.query(User).filter(
+    user = (await db.execute(select(User).where(
         (User.email == form_data.username) | (User.username == form_data.username)
-    ).first()
+    ))).scalars().first()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Geçersiz e-posta veya şifre",
@@ -84,11 +87,12 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     
     # Update last login
     user.last_login_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     # Create token
     access_token = create_access_token(
-        data={"sub": user.id, "email": user.email}
+        # python-jose rejects non-string subjects when decoding
+        data={"sub": str(user.id), "email": user.email}
     )
     
     return Token(access_token=access_token, user=UserResponse.from_orm(user))
@@ -104,7 +108,7 @@ async def get_me(current_user: User = Depends(get_current_active_user)):
 async def update_me(
     user_data: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kullanıcı profilini güncelle."""
     update_data = user_data.model_dump(exclude_unset=True)
@@ -113,8 +117,9 @@ async def update_me(
         setattr(current_user, field, value)
     
     current_user.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    await UserCache().invalidate_user(current_user.id)
     
     return current_user
 
@@ -124,10 +129,12 @@ async def change_password(
     current_password: str,
     new_password: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kullanıcı şifresini değiştir."""
-    if not verify_password(current_password, current_user.hashed_password):
+    # The password hash isn't part of the cached user snapshot
+    await db.refresh(current_user, ["hashed_password"])
+    if not await verify_password_async(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Mevcut şifre yanlış"
@@ -139,8 +146,9 @@ async def change_password(
             detail="Yeni şifre en az 8 karakter olmalı"
         )
     
-    current_user.hashed_password = get_password_hash(new_password)
+    current_user.hashed_password = await get_password_hash_async(new_password)
     current_user.updated_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    await UserCache().invalidate_user(current_user.id)
     
     return {"message": "Şifre başarıyla değiştirildi"}
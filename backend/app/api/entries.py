@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, func, select, tuple_
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
+import base64
+import json
 import uuid
 
 from app.database import get_db
 from app.models.entry import Entry, MoodType
 from app.models.user import User
-from app.schemas.entry import EntryCreate, EntryUpdate, EntryResponse, EntryList
+from app.models.transcript import TranscriptSegment
+from app.models.mood_stat import DailyMoodStat
+from app.schemas.entry import EntryCreate, EntryUpdate, EntryResponse, EntryList, TranscriptSegmentResponse
 from app.utils.security import get_current_active_user
+from app.utils.etag import UserDataETag, entry_etag
+from app.utils.dates import to_naive_utc
 from app.services.storage import StorageService
-from app.services.video import VideoProcessor
-from app.services.stt import SpeechToText
-from app.services.ai import AIService
+from app.services.queue import JobQueue
+from app.services.mood_stats import refresh_daily_mood_stats
+from app.services.streaks import record_entry_day, remove_entry_day
+from app.services.cache import bump_entries_version
 
 router = APIRouter(prefix="/entries", tags=["Günlük Kayıtları"])
 
@@ -22,7 +29,7 @@ router = APIRouter(prefix="/entries", tags=["Günlük Kayıtları"])
 async def create_entry(
     entry_data: EntryCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Yeni günlük kaydı oluştur (video olmadan).
@@ -41,15 +48,18 @@ async def create_entry(
         recorded_at=entry_data.recorded_at or datetime.utcnow()
     )
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    day = entry.recorded_at.date()
+    await db.run_sync(lambda session: refresh_daily_mood_stats(session, current_user.id, [day]))
+    await db.run_sync(lambda session: record_entry_day(session, current_user.id, day))
+    await db.run_sync(lambda session: bump_entries_version(session, current_user.id))
+    await db.commit()
+    await db.refresh(entry)
     
     return entry
 
 
 @router.post("/upload", response_model=EntryResponse, status_code=status.HTTP_201_CREATED)
 async def upload_video_entry(
-    background_tasks: BackgroundTasks,
     video: UploadFile = File(...),
     title: Optional[str] = Form(None),
     note: Optional[str] = Form(None),
@@ -60,12 +70,12 @@ async def upload_video_entry(
     location: Optional[str] = Form(None),
     weather: Optional[str] = Form(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Video ile birlikte yeni günlük kaydı oluştur.
     
-    Video yüklendikten sonra arka planda:
+    Video yüklendikten sonra işleme kuyruğuna alınır ve worker tarafından:
     - Video sıkıştırılır
     - Thumbnail oluşturulur
     - Sesten metne çevrilir (STT)
@@ -81,10 +91,9 @@ async def upload_video_entry(
     file_ext = video.filename.split(".")[-1] if "." in video.filename else "webm"
     video_key = f"entries/{current_user.id}/{uuid.uuid4()}.{file_ext}"
     
-    # Upload video to storage
+    # Stream video to storage in parts instead of reading it all into memory
     storage = StorageService()
-    video_content = await video.read()
-    video_url = await storage.upload_file(video_key, video_content, video.content_type)
+    video_url, file_size = await storage.upload_stream(video_key, video, video.content_type)
     
     # Parse mood
     mood_enum = None
@@ -95,7 +104,6 @@ async def upload_video_entry(
             pass
     
     # Parse tags
-    import json
     try:
         tags = json.loads(manual_tags) if manual_tags else []
     except json.JSONDecodeError:
@@ -106,7 +114,7 @@ async def upload_video_entry(
         user_id=current_user.id,
         video_url=video_url,
         video_key=video_key,
-        file_size_bytes=len(video_content),
+        file_size_bytes=file_size,
         mime_type=video.content_type,
         title=title,
         note=note,
@@ -120,136 +128,137 @@ async def upload_video_entry(
         is_processed=False
     )
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    await db.flush()
+    day = entry.recorded_at.date()
+    await db.run_sync(lambda session: refresh_daily_mood_stats(session, current_user.id, [day]))
+    await db.run_sync(lambda session: record_entry_day(session, current_user.id, day))
     
-    # Process video in background
-    background_tasks.add_task(process_video_entry, entry.id, video_key, db)
+    # Queue processing for the worker; committed together with the entry
+    await db.run_sync(lambda session: JobQueue(session).enqueue(entry.id))
+    await db.run_sync(lambda session: bump_entries_version(session, current_user.id))
+    await db.commit()
+    await db.refresh(entry)
     
     return entry
 
 
-async def process_video_entry(entry_id: int, video_key: str, db: Session):
-    """Background task to process video entry."""
+def encode_cursor(entry: Entry) -> str:
+    """Opaque cursor pointing after an entry in (recorded_at, id) order."""
+    raw = json.dumps([entry.recorded_at.isoformat(), entry.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises 400 on malformed input."""
     try:
-        entry = db.query(Entry).filter(Entry.id == entry_id).first()
-        if not entry:
-            return
-        
-        storage = StorageService()
-        video_processor = VideoProcessor()
-        stt = SpeechToText()
-        ai_service = AIService()
-        
-        # Download video for processing
-        video_path = await storage.download_to_temp(video_key)
-        
-        # Generate thumbnail
-        thumbnail_path = await video_processor.generate_thumbnail(video_path)
-        thumbnail_key = f"thumbnails/{entry.user_id}/{uuid.uuid4()}.jpg"
-        with open(thumbnail_path, "rb") as f:
-            entry.thumbnail_url = await storage.upload_file(thumbnail_key, f.read(), "image/jpeg")
-        
-        # Get video duration
-        entry.duration_seconds = await video_processor.get_duration(video_path)
-        
-        # Extract audio and transcribe
-        audio_path = await video_processor.extract_audio(video_path)
-        transcript_result = await stt.transcribe(audio_path)
-        entry.transcript = transcript_result.get("text", "")
-        
-        # AI processing (if transcript exists)
-        if entry.transcript:
-            entry.summary = await ai_service.summarize(entry.transcript)
-            entry.auto_tags = await ai_service.auto_tag(entry.transcript)
-            entry.sentiment_score = await ai_service.analyze_sentiment(entry.transcript)
-        
-        entry.is_processed = True
-        entry.updated_at = datetime.utcnow()
-        db.commit()
-        
-        # Cleanup temp files
-        import os
-        for path in [video_path, thumbnail_path, audio_path]:
-            if path and os.path.exists(path):
-                os.remove(path)
-                
-    except Exception as e:
-        print(f"Error processing entry {entry_id}: {e}")
-        # Mark as processed even on error to avoid retry loops
-        entry = db.query(Entry).filter(Entry.id == entry_id).first()
-        if entry:
-            entry.is_processed = True
-            db.commit()
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        recorded_at, entry_id = json.loads(raw)
+        return to_naive_utc(datetime.fromisoformat(recorded_at)), int(entry_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Geçersiz sayfa imleci (cursor)"
+        )
 
 
-@router.get("/", response_model=EntryList)
+@router.get("/", response_model=EntryList, dependencies=[Depends(UserDataETag("entries"))])
 async def list_entries(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     mood: Optional[str] = None,
     tag: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     favorites_only: bool = False,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Kullanıcının günlük kayıtlarını listele.
     
-    - Sayfalama desteklenir
+    - Sayfalama desteklenir: `page` ile sayfa numarası veya sonsuz kaydırma
+      için yanıttaki `next_cursor` değeri `cursor` olarak gönderilir
+    - Cursor modunda toplam sayı yalnızca `include_total=true` ile döner
     - Ruh haline, etiketlere ve tarihe göre filtreleme yapılabilir
     """
-    query = db.query(Entry).filter(Entry.user_id == current_user.id)
+    query = select(Entry).where(Entry.user_id == current_user.id)
+    filtered = False
     
     # Apply filters
     if mood:
         try:
-            query = query.filter(Entry.mood == MoodType(mood))
+            query = query.where(Entry.mood == MoodType(mood))
+            filtered = True
         except ValueError:
             pass
     
     if tag:
-        query = query.filter(
+        query = query.where(
             Entry.manual_tags.contains([tag]) | Entry.auto_tags.contains([tag])
         )
+        filtered = True
     
+    # recorded_at is naive UTC; asyncpg won't compare it with aware values
     if start_date:
-        query = query.filter(Entry.recorded_at >= start_date)
+        query = query.where(Entry.recorded_at >= to_naive_utc(start_date))
+        filtered = True
     
     if end_date:
-        query = query.filter(Entry.recorded_at <= end_date)
+        query = query.where(Entry.recorded_at <= to_naive_utc(end_date))
+        filtered = True
     
     if favorites_only:
-        query = query.filter(Entry.is_favorite == True)
+        query = query.where(Entry.is_favorite == True)
+        filtered = True
     
-    # Get total count
-    total = query.count()
+    # Get total count (page mode always, cursor mode on request)
+    total = None
+    if cursor is None or include_total:
+        if filtered:
+            total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        else:
+            # Unfiltered count from the daily rollup instead of the entries
+            total = await db.scalar(select(func.coalesce(func.sum(DailyMoodStat.entry_count), 0)).where(
+                DailyMoodStat.user_id == current_user.id
+            ))
     
-    # Apply pagination
-    entries = query.order_by(desc(Entry.recorded_at)).offset((page - 1) * page_size).limit(page_size).all()
+    query = query.order_by(desc(Entry.recorded_at), desc(Entry.id))
+    if cursor is not None:
+        # Keyset pagination: seek past the cursor on (recorded_at, id)
+        recorded_at, entry_id = decode_cursor(cursor)
+        query = query.where(tuple_(Entry.recorded_at, Entry.id) < tuple_(recorded_at, entry_id))
+        page = None
+    else:
+        query = query.offset((page - 1) * page_size)
+    
+    # Fetch one extra row to know if there is a next page
+    entries = (await db.execute(query.limit(page_size + 1))).scalars().all()
+    has_more = len(entries) > page_size
+    entries = entries[:page_size]
     
     return EntryList(
         items=entries,
         total=total,
         page=page,
         page_size=page_size,
-        has_more=(page * page_size) < total
+        has_more=has_more,
+        next_cursor=encode_cursor(entries[-1]) if has_more else None
     )
 
 
-@router.get("/{entry_id}", response_model=EntryResponse)
+@router.get("/{entry_id}", response_model=EntryResponse, dependencies=[Depends(entry_etag)])
 async def get_entry(
     entry_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Belirli bir günlük kaydını getir."""
-    entry = db.query(Entry).filter(
+    entry = (await db.execute(select(Entry).where(
         Entry.id == entry_id,
         Entry.user_id == current_user.id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not entry:
         raise HTTPException(
@@ -260,18 +269,46 @@ async def get_entry(
     return entry
 
 
+@router.get("/{entry_id}/segments", response_model=List[TranscriptSegmentResponse])
+async def get_entry_segments(
+    entry_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Kaydın zaman damgalı transkript bölümlerini getir.
+    
+    Videoda belirli bir ana atlamak için kullanılabilir.
+    """
+    entry_exists = (await db.execute(select(Entry.id).where(
+        Entry.id == entry_id,
+        Entry.user_id == current_user.id
+    ))).first()
+    
+    if not entry_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Kayıt bulunamadı"
+        )
+    
+    segments = await db.execute(select(TranscriptSegment).where(
+        TranscriptSegment.entry_id == entry_id
+    ).order_by(TranscriptSegment.start_seconds))
+    return segments.scalars().all()
+
+
 @router.put("/{entry_id}", response_model=EntryResponse)
 async def update_entry(
     entry_id: int,
     entry_data: EntryUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Günlük kaydını güncelle."""
-    entry = db.query(Entry).filter(
+    entry = (await db.execute(select(Entry).where(
         Entry.id == entry_id,
         Entry.user_id == current_user.id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not entry:
         raise HTTPException(
@@ -279,13 +316,23 @@ async def update_entry(
             detail="Kayıt bulunamadı"
         )
     
+    old_day = entry.recorded_at.date() if entry.recorded_at else None
     update_data = entry_data.model_dump(exclude_unset=True)
+    if update_data.get("recorded_at", True) is None:
+        # recorded_at can be moved but not cleared
+        del update_data["recorded_at"]
     for field, value in update_data.items():
         setattr(entry, field, value)
     
     entry.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(entry)
+    new_day = entry.recorded_at.date()
+    await db.run_sync(lambda session: refresh_daily_mood_stats(session, current_user.id, [old_day, new_day]))
+    if new_day != old_day:
+        await db.run_sync(lambda session: remove_entry_day(session, current_user.id, old_day))
+        await db.run_sync(lambda session: record_entry_day(session, current_user.id, new_day))
+    await db.run_sync(lambda session: bump_entries_version(session, current_user.id))
+    await db.commit()
+    await db.refresh(entry)
     
     return entry
 
@@ -294,13 +341,13 @@ async def update_entry(
 async def delete_entry(
     entry_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Günlük kaydını sil."""
-    entry = db.query(Entry).filter(
+    entry = (await db.execute(select(Entry).where(
         Entry.id == entry_id,
         Entry.user_id == current_user.id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not entry:
         raise HTTPException(
@@ -313,8 +360,12 @@ async def delete_entry(
         storage = StorageService()
         await storage.delete_file(entry.video_key)
     
-    db.delete(entry)
-    db.commit()
+    day = entry.recorded_at.date() if entry.recorded_at else None
+    await db.delete(entry)
+    await db.run_sync(lambda session: refresh_daily_mood_stats(session, current_user.id, [day]))
+    await db.run_sync(lambda session: remove_entry_day(session, current_user.id, day))
+    await db.run_sync(lambda session: bump_entries_version(session, current_user.id))
+    await db.commit()
     
     return None
 
@@ -323,13 +374,13 @@ async def delete_entry(
 async def toggle_favorite(
     entry_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Kaydı favorilere ekle/çıkar."""
-    entry = db.query(Entry).filter(
+    entry = (await db.execute(select(Entry).where(
         Entry.id == entry_id,
         Entry.user_id == current_user.id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not entry:
         raise HTTPException(
@@ -339,7 +390,8 @@ async def toggle_favorite(
     
     entry.is_favorite = not entry.is_favorite
     entry.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(entry)
+    await db.run_sync(lambda session: bump_entries_version(session, current_user.id))
+    await db.commit()
+    await db.refresh(entry)
     
     return entry
@@ -0,0 +1,103 @@
+"""
+Maintenance commands.
+
+    python -m app.cli rescore [--user-id ID] [--batch-size N] [--verbose]
+    python -m app.cli rebuild-mood-stats [--user-id ID]
+    python -m app.cli repair-streaks [--user-id ID]
+"""
+import argparse
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from app.database import SessionLocal
+from app.models.entry import Entry
+from app.services.ai import AIService
+from app.services.cache import bump_entries_version
+from app.services.mood_stats import rebuild_daily_mood_stats
+from app.services.streaks import repair_streaks
+
+
+def rescore(user_id: int = None, batch_size: int = 500, verbose: bool = False) -> int:
+    """
+    Re-tag and re-score all transcribed entries.
+
+    Entries are streamed from one session with a server-side cursor and
+    written back from a second one, one batched UPDATE per batch, so
+    memory stays flat regardless of history size.
+
+    Args:
+        user_id: Only rescore this user's entries
+        batch_size: Entries scored and updated per batch
+        verbose: Print progress after every batch
+
+    Returns:
+        Number of entries updated
+    """
+    ai = AIService()
+    read_db = SessionLocal()
+    write_db = SessionLocal()
+    updated = 0
+    try:
+        query = select(Entry.id, Entry.user_id, Entry.transcript).where(Entry.transcript.isnot(None))
+        if user_id is not None:
+            query = query.where(Entry.user_id == user_id)
+        result = read_db.execute(query.order_by(Entry.id).execution_options(yield_per=batch_size))
+
+        for batch in result.partitions():
+            tags, sentiments = ai.score_batch([transcript for _, _, transcript in batch])
+            now = datetime.utcnow()
+            write_db.execute(update(Entry), [
+                {"id": entry_id, "auto_tags": entry_tags, "sentiment_score": sentiment, "updated_at": now}
+                for (entry_id, _, _), entry_tags, sentiment in zip(batch, tags, sentiments)
+            ])
+            for batch_user_id in {entry_user_id for _, entry_user_id, _ in batch}:
+                bump_entries_version(write_db, batch_user_id)
+            write_db.commit()
+            updated += len(batch)
+            if verbose:
+                print(f"Rescored {updated} entries")
+    finally:
+        write_db.close()
+        read_db.close()
+    return updated
+
+
+def main(argv=None):
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rescore_parser = commands.add_parser("rescore", help="Re-tag and re-score entries in bulk")
+    rescore_parser.add_argument("--user-id", type=int, default=None)
+    rescore_parser.add_argument("--batch-size", type=int, default=500)
+    rescore_parser.add_argument("--verbose", action="store_true", help="Print progress after every batch")
+
+    stats_parser = commands.add_parser("rebuild-mood-stats", help="Rebuild the daily mood rollup")
+    stats_parser.add_argument("--user-id", type=int, default=None)
+
+    streaks_parser = commands.add_parser("repair-streaks", help="Rebuild user streaks from history")
+    streaks_parser.add_argument("--user-id", type=int, default=None)
+
+    args = parser.parse_args(argv)
+    if args.command == "rescore":
+        count = rescore(args.user_id, args.batch_size, args.verbose)
+        print(f"✅ Rescored {count} entries")
+    elif args.command == "rebuild-mood-stats":
+        db = SessionLocal()
+        try:
+            count = rebuild_daily_mood_stats(db, args.user_id)
+        finally:
+            db.close()
+        print(f"✅ Rebuilt {count} days of mood stats")
+    elif args.command == "repair-streaks":
+        db = SessionLocal()
+        try:
+            count = repair_streaks(db, args.user_id)
+        finally:
+            db.close()
+        print(f"✅ Repaired streaks of {count} users")
+
+
+if __name__ == "__main__":
+    main()
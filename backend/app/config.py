@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -18,9 +18,21 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-super-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    AUTH_CACHE_SIZE: int = 10000             # Cached tokens/users per process
+    AUTH_CACHE_TTL_SECONDS: int = 60         # Max staleness of a cached user
+    AUTH_CACHE_REDIS: bool = False           # Share user snapshots through Redis
+    BCRYPT_ROUNDS: int = 12                  # bcrypt cost factor for new hashes
+    PASSWORD_HASH_WORKERS: int = 2           # Threads hashing/verifying passwords
+    PASSWORD_HASH_MAX_PENDING: int = 32      # Reject with 503 beyond this many queued
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
+    REDIS_TIMEOUT_SECONDS: float = 0.25      # Connect/read timeout of cache calls
+    REDIS_RETRY_SECONDS: int = 30            # Skip Redis this long after an error
+    RESPONSE_CACHE_REDIS: bool = False       # Share cached responses through Redis
+    RESPONSE_CACHE_SIZE: int = 10000         # Cached responses per process (in-memory)
+    RESPONSE_CACHE_TTL_SECONDS: int = 300    # Max lifetime of a cached response
+    ANALYTICS_MAX_AGE_SECONDS: int = 60      # Cache-Control max-age of analytics charts
     
     # MinIO / S3
     MINIO_ENDPOINT: str = "localhost:9000"
@@ -28,10 +40,40 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str = "minioadmin"
     MINIO_BUCKET: str = "gunluk-videos"
     MINIO_SECURE: bool = False
-    
+    UPLOAD_PART_SIZE_MB: int = 8  # Multipart upload part size (min 5)
+
     # Whisper STT
+    STT_BACKEND: str = "whisper"  # whisper, faster-whisper, api, remote
     WHISPER_MODEL: str = "base"  # tiny, base, small, medium, large
-    
+    STT_DEVICE: str = "cpu"                  # faster-whisper device
+    STT_COMPUTE_TYPE: str = "int8"           # faster-whisper quantization
+    STT_CPU_THREADS: int = 0                 # 0 = library default
+    OPENAI_API_KEY: Optional[str] = None     # For the api backend
+    PRELOAD_MODELS: bool = False             # Warm up models in the API lifespan
+    PRELOAD_RETRY_SECONDS: float = 5         # First retry delay after a failed preload
+    PRELOAD_RETRY_MAX_SECONDS: float = 300   # Retry delay doubles up to this
+    SUMMARIZER_MODEL: str = ""               # e.g. facebook/bart-large-cnn, empty = disabled
+    STT_CHUNK_SECONDS: int = 120             # Transcribe and persist in chunks of this size
+    STT_BATCHING: bool = False               # Batch 30s windows across entries (whisper backend)
+    STT_BATCH_SIZE: int = 8                  # Max windows per batched decode
+    STT_BATCH_MAX_WAIT_MS: int = 200         # Max time to wait for a full batch
+
+    # Model server (python -m app.model_server, used by STT_BACKEND=remote)
+    MODEL_SERVER_SOCKET: str = "/tmp/gunluk-models.sock"
+    MODEL_SERVER_STT_BACKEND: str = "whisper"  # Backend the server runs
+    MODEL_SERVER_WAIT_SECONDS: int = 600     # How long clients wait for the server on warmup
+
+    # FFmpeg
+    FFMPEG_CONCURRENCY: int = 2              # Max concurrent ffmpeg/ffprobe processes
+    FFMPEG_TIMEOUT_SECONDS: int = 600        # Default per-command timeout
+
+    # Processing worker (python -m app.worker)
+    WORKER_CONCURRENCY: int = 2              # Jobs processed in parallel per worker
+    WORKER_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 600  # Reclaim jobs of dead workers after this
+    JOB_MAX_ATTEMPTS: int = 3                # Attempts per pipeline stage
+    JOB_RETRY_BACKOFF_SECONDS: int = 30
+
     # CORS - comma separated string
     CORS_ORIGINS: str = "http://localhost:3000,http://127.0.0.1:3000"
     
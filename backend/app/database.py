@@ -1,9 +1,11 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-# Create database engine
+# Create database engine (worker, CLI, migrations)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
@@ -14,14 +16,31 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    """Same database through the asyncpg driver."""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
+# Async engine for the API routers, so queries don't block the event loop
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20
+)
+
+# Objects stay loaded after commit: lazy loads aren't possible on AsyncSession
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session."""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
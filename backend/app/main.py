@@ -1,20 +1,32 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.database import engine, Base
+from app.database import async_engine
+from app.services.cache import ResponseCache
 from app.api import auth_router, entries_router, analytics_router
+from app.services.warmup import start_preload, mark_models_ready, models_ready
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
-    # Startup: Create database tables
-    Base.metadata.create_all(bind=engine)
-    print("🚀 Database tables created")
+    # Schema is managed by Alembic: run `alembic upgrade head` before starting
+    print("🚀 Application starting")
+    
+    # Models: warm up in the background, /ready reports when done
+    if settings.PRELOAD_MODELS:
+        app.state.warmup_task = start_preload()
+    else:
+        mark_models_ready()
+    
     yield
     # Shutdown
+    if settings.PRELOAD_MODELS:
+        app.state.warmup_task.cancel()
+    await async_engine.dispose()
     print("👋 Application shutting down")
 
 
@@ -74,3 +86,20 @@ async def health_check():
         "status": "healthy",
         "version": settings.APP_VERSION
     }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Process-local cache counters for monitoring."""
+    return {"response_cache": ResponseCache().metrics()}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: false until preloaded models are resident."""
+    if not models_ready():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "loading", "models_ready": False}
+        )
+    return {"status": "ready", "models_ready": True}
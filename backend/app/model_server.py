@@ -0,0 +1,99 @@
+"""
+Local model server.
+
+Owns the speech-to-text and summarization models in a single process
+and serves them over a Unix socket, so adding API or worker processes
+doesn't add more copies of the weights:
+
+    python -m app.model_server
+
+Clients select it with STT_BACKEND=remote and the same
+MODEL_SERVER_SOCKET path.
+"""
+import asyncio
+import os
+import signal
+import threading
+from multiprocessing.connection import Listener
+
+from app.config import settings
+from app.services.stt import get_stt
+from app.services.ai import AIService
+from app.services.warmup import preload_models
+
+
+class ModelServer:
+    """Accepts connections in threads and runs inference on one event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        if settings.MODEL_SERVER_STT_BACKEND == "remote":
+            raise ValueError("MODEL_SERVER_STT_BACKEND can't be 'remote'")
+        self.stt = get_stt(settings.MODEL_SERVER_STT_BACKEND)
+        self.ai = AIService()
+        self.ops = {
+            "ping": self._ping,
+            "transcribe": self.stt.transcribe,
+            "detect_language": self.stt.detect_language,
+            "summarize": self.ai.summarize,
+        }
+
+    async def _ping(self):
+        return "pong"
+
+    def handle(self, conn):
+        """Serve requests on one connection until the client closes it."""
+        with conn:
+            while True:
+                try:
+                    op, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    if op not in self.ops:
+                        raise ValueError(f"Unknown operation '{op}'")
+                    # Run on the shared loop so concurrent requests can batch
+                    future = asyncio.run_coroutine_threadsafe(self.ops[op](**kwargs), self.loop)
+                    conn.send(("ok", future.result()))
+                except Exception as e:
+                    conn.send(("error", f"{type(e).__name__}: {e}"))
+
+    def serve_forever(self, listener: Listener):
+        """Accept loop, runs in its own thread."""
+        while True:
+            try:
+                conn = listener.accept()
+            except OSError:
+                return  # Listener closed
+            except Exception as e:
+                print(f"Model server accept error: {e}")
+                continue
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+
+async def main():
+    """Model server entry point."""
+    server = ModelServer(asyncio.get_running_loop())
+    await preload_models(settings.MODEL_SERVER_STT_BACKEND)
+
+    address = settings.MODEL_SERVER_SOCKET
+    if os.path.exists(address):
+        os.remove(address)  # Stale socket from a previous run
+
+    listener = Listener(address, family="AF_UNIX", authkey=settings.SECRET_KEY.encode())
+    threading.Thread(target=server.serve_forever, args=(listener,), daemon=True).start()
+    print(f"🧠 Model server listening on {address}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    listener.close()
+    print("👋 Model server shutting down")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
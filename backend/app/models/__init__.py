@@ -1,4 +1,7 @@
 from app.models.user import User
 from app.models.entry import Entry, MoodType
+from app.models.job import ProcessingJob, JobStatus
+from app.models.transcript import TranscriptSegment
+from app.models.mood_stat import DailyMoodStat
 
-__all__ = ["User", "Entry", "MoodType"]
+__all__ = ["User", "Entry", "MoodType", "ProcessingJob", "JobStatus", "TranscriptSegment", "DailyMoodStat"]
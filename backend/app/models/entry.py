@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Index, text
 from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -24,7 +25,7 @@ class Entry(Base):
     """Journal entry model with video and AI-generated content."""
     
     __tablename__ = "entries"
-    
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
@@ -39,7 +40,7 @@ class Entry(Base):
     # AI Generated Content
     transcript = Column(Text)                  # Whisper STT output
     summary = Column(Text)                     # AI generated summary (2-3 sentences)
-    auto_tags = Column(JSON, default=list)     # ["work", "stress", "meeting"]
+    auto_tags = Column(JSONB, default=list)    # ["work", "stress", "meeting"]
     sentiment_score = Column(Float)            # -1 to 1, overall sentiment
     
     # User Input
@@ -47,7 +48,7 @@ class Entry(Base):
     note = Column(Text)                        # Additional written notes
     mood = Column(SQLEnum(MoodType))
     mood_intensity = Column(Integer, default=5)  # 1-10 scale
-    manual_tags = Column(JSON, default=list)   # User added tags
+    manual_tags = Column(JSONB, default=list)  # User added tags
     
     # Metadata
     is_private = Column(Boolean, default=True)
@@ -63,6 +64,13 @@ class Entry(Base):
     
     # Relationships
     user = relationship("User", back_populates="entries")
+    segments = relationship(
+        "TranscriptSegment",
+        back_populates="entry",
+        order_by="TranscriptSegment.start_seconds",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
     
     def __repr__(self):
         return f"<Entry {self.id} by User {self.user_id}>"
@@ -71,3 +79,25 @@ class Entry(Base):
     def all_tags(self) -> list:
         """Combine auto and manual tags."""
         return list(set((self.auto_tags or []) + (self.manual_tags or [])))
+
+
+# Indexes for the per-user access patterns (see alembic/versions)
+# Listing and keyset pagination, newest first
+Index("ix_entries_user_recorded", Entry.user_id, Entry.recorded_at.desc(), Entry.id.desc())
+# Favorites filter
+Index("ix_entries_user_favorite", Entry.user_id, postgresql_where=Entry.is_favorite)
+# Mood filter
+Index("ix_entries_user_mood", Entry.user_id, Entry.mood)
+# On-this-day lookups
+Index(
+    "ix_entries_user_month_day",
+    Entry.user_id,
+    # Must match extract("month"/"day", Entry.recorded_at) in queries
+    text("(EXTRACT(month FROM recorded_at))"),
+    text("(EXTRACT(day FROM recorded_at))")
+)
+# Containment (@>) lookups for tag filtering
+Index("ix_entries_manual_tags_gin", Entry.manual_tags, postgresql_using="gin",
+      postgresql_ops={"manual_tags": "jsonb_path_ops"})
+Index("ix_entries_auto_tags_gin", Entry.auto_tags, postgresql_using="gin",
+      postgresql_ops={"auto_tags": "jsonb_path_ops"})
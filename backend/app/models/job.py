@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Enum as SQLEnum
+from datetime import datetime
+import enum
+from app.database import Base
+
+
+class JobStatus(str, enum.Enum):
+    """Lifecycle states of a processing job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ProcessingJob(Base):
+    """Durable video processing job, claimed by workers with SKIP LOCKED."""
+
+    __tablename__ = "processing_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entry_id = Column(Integer, ForeignKey("entries.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Pipeline position
+    stage = Column(String(50), nullable=False)   # Current (not yet completed) stage
+    status = Column(SQLEnum(JobStatus), default=JobStatus.PENDING, nullable=False, index=True)
+    attempts = Column(Integer, default=0)         # Attempts for the current stage
+    last_error = Column(Text)
+
+    # Scheduling
+    run_after = Column(DateTime, default=datetime.utcnow)  # Retry backoff
+    locked_until = Column(DateTime)                        # Visibility timeout
+    locked_by = Column(String(255))                        # Worker id
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ProcessingJob {self.id} entry={self.entry_id} {self.stage}/{self.status}>"
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, JSON, UniqueConstraint
+from datetime import datetime
+from app.database import Base
+
+
+class DailyMoodStat(Base):
+    """Per-user, per-day rollup of entries, read by the analytics endpoints."""
+
+    __tablename__ = "daily_mood_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_daily_mood_stats_user_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)                # Day of recorded_at (UTC)
+
+    # All entries of the day
+    entry_count = Column(Integer, default=0, nullable=False)
+    duration_seconds = Column(Float, default=0, nullable=False)
+
+    # Entries with a mood
+    mood_counts = Column(JSON, default=dict)           # {"happy": 2, "tired": 1}
+    intensity_sums = Column(JSON, default=dict)        # {"happy": 13, "tired": 4}
+    dominant_mood = Column(String(20))                 # Mood of the most intense entry
+    dominant_intensity = Column(Integer)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def mood_entry_count(self) -> int:
+        """Number of entries of the day with a mood."""
+        return sum((self.mood_counts or {}).values())
+
+    def __repr__(self):
+        return f"<DailyMoodStat user={self.user_id} {self.date}>"
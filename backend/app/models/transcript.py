@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, Float, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.database import Base
+
+
+class TranscriptSegment(Base):
+    """Timed transcript segment, persisted as transcription progresses."""
+    
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        UniqueConstraint("entry_id", "start_seconds", name="uq_transcript_segments_entry_start"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    entry_id = Column(Integer, ForeignKey("entries.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    start_seconds = Column(Float, nullable=False)  # Offset in the video
+    end_seconds = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+    chunk_end_seconds = Column(Float, nullable=False)  # End of the transcribed chunk (resume point)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    entry = relationship("Entry", back_populates="segments")
+    
+    def __repr__(self):
+        return f"<TranscriptSegment entry={self.entry_id} {self.start_seconds:.1f}s>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -27,6 +27,14 @@ class User(Base):
     timezone = Column(String(50), default="Europe/Istanbul")
     theme = Column(String(20), default="dark")
     
+    # Streaks (maintained by app.services.streaks)
+    current_streak = Column(Integer, default=0)   # Run of consecutive days ending at last_entry_date
+    longest_streak = Column(Integer, default=0)
+    last_entry_date = Column(Date)                # Latest day with an entry (UTC)
+    
+    # Bumped with every change to the user's entries (ETags, response cache)
+    entries_version = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -2,10 +2,12 @@ from app.schemas.user import (
     UserCreate, UserUpdate, UserResponse, UserLogin, Token, TokenData
 )
 from app.schemas.entry import (
-    EntryCreate, EntryUpdate, EntryResponse, EntryList, MoodType
+    EntryCreate, EntryUpdate, EntryResponse, EntryList, MoodType,
+    TranscriptSegmentResponse
 )
 
 __all__ = [
     "UserCreate", "UserUpdate", "UserResponse", "UserLogin", "Token", "TokenData",
-    "EntryCreate", "EntryUpdate", "EntryResponse", "EntryList", "MoodType"
+    "EntryCreate", "EntryUpdate", "EntryResponse", "EntryList", "MoodType",
+    "TranscriptSegmentResponse"
 ]
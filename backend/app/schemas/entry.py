@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum
 
+from app.utils.dates import to_naive_utc
+
 
 class MoodType(str, Enum):
     """Mood types for journal entries."""
@@ -33,6 +35,12 @@ class EntryBase(BaseModel):
 class EntryCreate(EntryBase):
     """Schema for creating an entry."""
     recorded_at: Optional[datetime] = None
+    
+    @field_validator("recorded_at")
+    @classmethod
+    def recorded_at_to_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Stored as naive UTC; aware values from clients are converted."""
+        return to_naive_utc(value)
 
 
 class EntryUpdate(BaseModel):
@@ -46,6 +54,13 @@ class EntryUpdate(BaseModel):
     is_favorite: Optional[bool] = None
     location: Optional[str] = None
     weather: Optional[str] = None
+    recorded_at: Optional[datetime] = None
+    
+    @field_validator("recorded_at")
+    @classmethod
+    def recorded_at_to_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Stored as naive UTC; aware values from clients are converted."""
+        return to_naive_utc(value)
 
 
 class EntryResponse(EntryBase):
@@ -69,13 +84,25 @@ class EntryResponse(EntryBase):
         from_attributes = True
 
 
+class TranscriptSegmentResponse(BaseModel):
+    """Schema for a timed transcript segment."""
+    id: int
+    start_seconds: float
+    end_seconds: float
+    text: str
+    
+    class Config:
+        from_attributes = True
+
+
 class EntryList(BaseModel):
     """Schema for paginated entry list."""
     items: List[EntryResponse]
-    total: int
-    page: int
+    total: Optional[int] = None        # Omitted in cursor mode unless include_total
+    page: Optional[int] = None         # None in cursor mode
     page_size: int
     has_more: bool
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to get the next page
 
 
 class EntryStats(BaseModel):
@@ -83,6 +110,8 @@ class EntryStats(BaseModel):
     total_entries: int
     total_duration_minutes: float
     mood_distribution: dict
+    # Last 7 / 30 UTC calendar days, today included
     entries_this_week: int
     entries_this_month: int
     streak_days: int
+    longest_streak: int = 0
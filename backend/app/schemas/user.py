@@ -59,3 +59,4 @@ class TokenData(BaseModel):
     """Schema for decoded token data."""
     user_id: Optional[int] = None
     email: Optional[str] = None
+    expires_at: Optional[int] = None  # Unix time ("exp" claim)
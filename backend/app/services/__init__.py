@@ -1,6 +1,11 @@
 from app.services.storage import StorageService
 from app.services.video import VideoProcessor
-from app.services.stt import SpeechToText
+from app.services.stt import SpeechToText, BatchTranscriber, FasterWhisperSpeechToText, get_stt
 from app.services.ai import AIService
+from app.services.queue import JobQueue, JobLostError
 
-__all__ = ["StorageService", "VideoProcessor", "SpeechToText", "AIService"]
+__all__ = [
+    "StorageService", "VideoProcessor", "SpeechToText", "BatchTranscriber",
+    "FasterWhisperSpeechToText", "get_stt", "AIService", "JobQueue",
+    "JobLostError"
+]
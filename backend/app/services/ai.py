@@ -1,5 +1,45 @@
-from typing import List, Optional
+from typing import List, Optional, Iterable, Dict, Set, Tuple
 import re
+from app.config import settings
+from app.utils.text import tokenize, stem_forms, vocabulary_form
+
+
+class KeywordIndex:
+    """
+    Hashed token lookup for a fixed vocabulary.
+    
+    Each keyword is indexed under its vocabulary form and a token matches
+    it if any of its stem forms does, so "dizide" and "diziler" match
+    "dizi" but "dizim" (my knee) does not. Multiword keywords match
+    consecutive tokens. Matching whole tokens instead of substrings keeps
+    e.g. "iş" from firing inside "kişi".
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        # First word's form -> (forms of all words, keyword)
+        self._index: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        for keyword in set(keywords):
+            forms = tuple(vocabulary_form(token) for token in tokenize(keyword))
+            if forms:
+                self._index.setdefault(forms[0], []).append((forms, keyword))
+    
+    def match(self, tokens: List[str]) -> Set[str]:
+        """Return the keywords occurring in a token sequence."""
+        return set(self.occurrences(tokens))
+    
+    def occurrences(self, tokens: List[str]) -> List[str]:
+        """Return the keyword of every match in a token sequence, repeats included."""
+        found = []
+        token_forms = [stem_forms(token) for token in tokens]
+        for i, forms in enumerate(token_forms):
+            for form in forms:
+                for keyword_forms, keyword in self._index.get(form, ()):
+                    n = len(keyword_forms)
+                    if i + n <= len(tokens) and all(
+                        keyword_forms[j] in token_forms[i + j] for j in range(1, n)
+                    ):
+                        found.append(keyword)
+        return found
 
 
 class AIService:
@@ -41,13 +81,18 @@ class AIService:
         return cls._instance
     
     def _load_summarizer(self):
-        """Lazy load the summarization model."""
-        if self._summarizer is None:
+        """
+        Lazy load the summarization model.
+        
+        Disabled unless SUMMARIZER_MODEL is set, since summaries are
+        currently extractive and the model output is not used.
+        """
+        if self._summarizer is None and settings.SUMMARIZER_MODEL:
             try:
                 from transformers import pipeline
                 self._summarizer = pipeline(
                     "summarization",
-                    model="facebook/bart-large-cnn",
+                    model=settings.SUMMARIZER_MODEL,
                     device=-1  # CPU
                 )
             except Exception as e:
@@ -55,6 +100,10 @@ class AIService:
                 self._summarizer = None
         return self._summarizer
     
+    def warmup(self):
+        """Load configured models ahead of the first request."""
+        self._load_summarizer()
+    
     async def summarize(self, text: str, max_length: int = 100) -> str:
         """
         Generate a summary from the transcript.
@@ -82,12 +131,50 @@ class AIService:
             print(f"Summarization error: {e}")
             return self._extractive_summary(text, max_sentences=2)
     
-    def _extractive_summary(self, text: str, max_sentences: int = 2) -> str:
-        """Simple extractive summarization for Turkish text."""
-        # Split into sentences
+    # One index over all vocabularies, built once
+    _index = KeywordIndex(
+        [keyword for keywords in KEYWORDS.values() for keyword in keywords]
+        + POSITIVE_WORDS + NEGATIVE_WORDS
+    )
+    _keyword_tags = {}
+    for _tag, _keywords in KEYWORDS.items():
+        for _keyword in _keywords:
+            _keyword_tags.setdefault(_keyword, []).append(_tag)
+    del _tag, _keywords, _keyword
+    
+    # Fixed vocabulary order for the batch term matrix
+    _vocabulary = sorted(
+        set(_keyword_tags) | set(POSITIVE_WORDS) | set(NEGATIVE_WORDS)
+    )
+    _vocabulary_ids = {word: i for i, word in enumerate(_vocabulary)}
+    _batch_weights = None
+    
+    def _scan(self, text: str) -> Dict:
+        """
+        Tokenize text once and match all vocabularies against it.
+        
+        Returns:
+            Dictionary with sentences, per-sentence tokens, per-sentence
+            matched keywords and the set of all matched keywords
+        """
         sentences = re.split(r'[.!?]+', text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
+        sentence_tokens = [tokenize(sentence) for sentence in sentences]
+        sentence_keywords = [self._index.match(tokens) for tokens in sentence_tokens]
+        
+        return {
+            "sentences": sentences,
+            "sentence_tokens": sentence_tokens,
+            "sentence_keywords": sentence_keywords,
+            "keywords": set().union(*sentence_keywords)
+        }
+    
+    def _extractive_summary(self, text: str, max_sentences: int = 2, scan: Optional[Dict] = None) -> str:
+        """Simple extractive summarization for Turkish text."""
+        scan = scan or self._scan(text)
+        sentences = scan["sentences"]
+        
         if len(sentences) <= max_sentences:
             return text
         
@@ -95,17 +182,17 @@ class AIService:
         scored = []
         for i, sentence in enumerate(sentences):
             score = 0
-            words = sentence.lower().split()
+            words = scan["sentence_tokens"][i]
             
             # First sentence bonus
             if i == 0:
                 score += 2
             
             # Keyword scoring
-            for category, keywords in self.KEYWORDS.items():
-                for keyword in keywords:
-                    if keyword in sentence.lower():
-                        score += 1
+            score += sum(
+                len(self._keyword_tags.get(keyword, ()))
+                for keyword in scan["sentence_keywords"][i]
+            )
             
             # Length penalty for very short sentences
             if len(words) < 5:
@@ -120,6 +207,149 @@ class AIService:
         summary = ". ".join([sentences[i] for i in top_indices])
         return summary + "."
     
+    def _tags_from_scan(self, scan: Dict) -> List[str]:
+        """Tags whose keywords were matched, in KEYWORDS order (max 5)."""
+        found = scan["keywords"]
+        return [
+            tag for tag, keywords in self.KEYWORDS.items()
+            if any(keyword in found for keyword in keywords)
+        ][:5]
+    
+    def _sentiment_from_scan(self, scan: Dict) -> float:
+        """Sentiment score from the distinct positive/negative words matched."""
+        found = scan["keywords"]
+        positive_count = sum(1 for word in self.POSITIVE_WORDS if word in found)
+        negative_count = sum(1 for word in self.NEGATIVE_WORDS if word in found)
+        
+        total = positive_count + negative_count
+        if total == 0:
+            return 0.0
+        
+        score = (positive_count - negative_count) / max(total, 1)
+        return max(-1.0, min(1.0, score))
+    
+    async def analyze_text(self, text: str) -> Dict:
+        """
+        Summary, tags and sentiment from a single scan of the text.
+        
+        Args:
+            text: Transcript text
+            
+        Returns:
+            Dictionary with summary, tags and sentiment
+        """
+        if not text:
+            return {"summary": text, "tags": [], "sentiment": 0.0}
+        
+        scan = self._scan(text)
+        if sum(len(tokens) for tokens in scan["sentence_tokens"]) < 30:
+            summary = text
+        else:
+            summary = self._extractive_summary(text, max_sentences=2, scan=scan)
+        
+        return {
+            "summary": summary,
+            "tags": self._tags_from_scan(scan),
+            "sentiment": self._sentiment_from_scan(scan)
+        }
+    
+    def _weights(self) -> Dict:
+        """Vocabulary-by-tag incidence matrix and polarity vector (built once)."""
+        if self._batch_weights is None:
+            import numpy as np
+            tags = list(self.KEYWORDS)
+            incidence = np.zeros((len(self._vocabulary), len(tags)), dtype=np.int32)
+            polarity = np.zeros(len(self._vocabulary), dtype=np.int32)
+            for word, i in self._vocabulary_ids.items():
+                for tag in self._keyword_tags.get(word, ()):
+                    incidence[i, tags.index(tag)] = 1
+                if word in self.POSITIVE_WORDS:
+                    polarity[i] = 1
+                elif word in self.NEGATIVE_WORDS:
+                    polarity[i] = -1
+            AIService._batch_weights = {"tags": tags, "incidence": incidence, "polarity": polarity}
+        return self._batch_weights
+    
+    def _term_matrix(self, texts: List[Optional[str]]):
+        """
+        Document-by-vocabulary count matrix.
+        
+        Each text is tokenized once, sentence by sentence like _scan, and
+        every keyword occurrence is added to its cell with np.add.at.
+        
+        Returns:
+            int32 array of shape (len(texts), len(vocabulary))
+        """
+        import numpy as np
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            if not text:
+                continue
+            for sentence in re.split(r'[.!?]+', text):
+                for keyword in self._index.occurrences(tokenize(sentence)):
+                    rows.append(row)
+                    cols.append(self._vocabulary_ids[keyword])
+        counts = np.zeros((len(texts), len(self._vocabulary)), dtype=np.int32)
+        np.add.at(counts, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), 1)
+        return counts
+    
+    def score_batch(self, texts: List[Optional[str]]) -> Tuple[List[List[str]], List[float]]:
+        """
+        Tags and sentiment for many texts, scored with matrix products.
+        
+        Matching is still a Python pass over each text's tokens; only the
+        scoring runs on arrays. A keyword counts once per text however
+        often it repeats, so the results are the same as auto_tag and
+        analyze_sentiment called on each text.
+        
+        Args:
+            texts: Transcript or note texts (None/empty allowed)
+            
+        Returns:
+            (tags, sentiments) lists aligned with texts
+        """
+        import numpy as np
+        weights = self._weights()
+        present = (self._term_matrix(texts) > 0).astype(np.int32)
+        
+        # Tag hits: presence matrix times the keyword-by-tag incidence matrix
+        tag_hits = present @ weights["incidence"]
+        
+        positive = present @ (weights["polarity"] > 0)
+        negative = present @ (weights["polarity"] < 0)
+        total = positive + negative
+        sentiments = np.clip((positive - negative) / np.maximum(total, 1), -1.0, 1.0)
+        
+        tags = [
+            [weights["tags"][i] for i in np.flatnonzero(hits)[:5]]
+            for hits in tag_hits
+        ]
+        return tags, [float(score) for score in sentiments]
+    
+    async def auto_tag_batch(self, texts: List[Optional[str]]) -> List[List[str]]:
+        """
+        Extract tags from many texts at once.
+        
+        Args:
+            texts: Transcript or note texts
+            
+        Returns:
+            List of tag lists (max 5 each), aligned with texts
+        """
+        return self.score_batch(texts)[0]
+    
+    async def analyze_sentiment_batch(self, texts: List[Optional[str]]) -> List[float]:
+        """
+        Analyze sentiment of many texts at once.
+        
+        Args:
+            texts: Texts to analyze
+            
+        Returns:
+            Sentiment scores from -1 to 1, aligned with texts
+        """
+        return self.score_batch(texts)[1]
+    
     async def auto_tag(self, text: str) -> List[str]:
         """
         Extract relevant tags from text.
@@ -133,17 +363,7 @@ class AIService:
         if not text:
             return []
         
-        text_lower = text.lower()
-        found_tags = []
-        
-        for tag, keywords in self.KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    if tag not in found_tags:
-                        found_tags.append(tag)
-                    break
-        
-        return found_tags[:5]
+        return self._tags_from_scan(self._scan(text))
     
     async def analyze_sentiment(self, text: str) -> float:
         """
@@ -158,17 +378,7 @@ class AIService:
         if not text:
             return 0.0
         
-        text_lower = text.lower()
-        
-        positive_count = sum(1 for word in self.POSITIVE_WORDS if word in text_lower)
-        negative_count = sum(1 for word in self.NEGATIVE_WORDS if word in text_lower)
-        
-        total = positive_count + negative_count
-        if total == 0:
-            return 0.0
-        
-        score = (positive_count - negative_count) / max(total, 1)
-        return max(-1.0, min(1.0, score))
+        return self._sentiment_from_scan(self._scan(text))
     
     async def suggest_mood(self, text: str) -> Optional[str]:
         """
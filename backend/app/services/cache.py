@@ -0,0 +1,354 @@
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+
+    Thread-safe, since sync endpoints and dependencies run in the
+    threadpool while async ones run on the event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_redis = None
+# Monotonic time until which Redis is skipped after an error
+_redis_down_until = 0.0
+
+
+def get_redis():
+    """
+    Shared asyncio Redis client, or None if redis isn't installed or
+    recently failed (see redis_failed).
+
+    Created lazily on first use.
+    """
+    global _redis
+    if _redis is None:
+        try:
+            import redis.asyncio as redis
+            _redis = redis.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
+                socket_timeout=settings.REDIS_TIMEOUT_SECONDS
+            )
+        except ImportError:
+            logger.warning("redis package not installed, using in-process cache only")
+            _redis = False
+    if time.monotonic() < _redis_down_until:
+        return None
+    return _redis or None
+
+
+def redis_failed(error: Exception):
+    """
+    Skip Redis for REDIS_RETRY_SECONDS after a failed call.
+
+    Callers fall back to their in-process cache meanwhile, so an
+    unreachable Redis costs one timeout per retry window instead of one
+    per request.
+    """
+    global _redis_down_until
+    if time.monotonic() >= _redis_down_until:
+        logger.warning(
+            "Redis cache error, using in-process cache for %ss: %s",
+            settings.REDIS_RETRY_SECONDS, error
+        )
+    _redis_down_until = time.monotonic() + settings.REDIS_RETRY_SECONDS
+
+
+class UserCache:
+    """
+    Cache for authenticated-user resolution.
+
+    Holds decoded access tokens (token hash -> user id) and a snapshot of
+    the user's profile/status columns, so authenticated requests skip the
+    JWT decode and the users lookup. Snapshots are kept in-process, or in
+    Redis when AUTH_CACHE_REDIS is set so that invalidations reach every
+    API process. Never holds the password hash.
+
+    Without Redis (or while it is unreachable) invalidate_user only
+    reaches the calling process: with several API workers, the others
+    keep serving the old profile, including a deactivated account, for
+    up to AUTH_CACHE_TTL_SECONDS. Run more than one worker with
+    AUTH_CACHE_REDIS, or keep the TTL short.
+
+    Handlers get a User built from the snapshot; the columns outside
+    SNAPSHOT_FIELDS are not loaded and must be refreshed before use
+    (tests/test_auth.py checks every authenticated route).
+    """
+
+    _instance = None
+
+    # Columns copied into the snapshot
+    SNAPSHOT_FIELDS = (
+        "id", "email", "username", "full_name", "avatar_url", "bio",
+        "is_active", "is_premium", "is_verified", "language", "timezone",
+        "theme", "created_at", "updated_at",
+    )
+
+    def __new__(cls):
+        """Singleton pattern."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._tokens = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+            cls._instance._users = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+        return cls._instance
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"auth:user:{user_id}"
+
+    def _redis(self):
+        return get_redis() if settings.AUTH_CACHE_REDIS else None
+
+    def get_token(self, token: str) -> Optional[int]:
+        """User id of a previously decoded token."""
+        return self._tokens.get(self._token_key(token))
+
+    def set_token(self, token: str, user_id: int, expires_at: Optional[float] = None):
+        """
+        Remember a decoded token.
+
+        Args:
+            token: Raw access token
+            user_id: Subject of the token
+            expires_at: Token expiry (unix time); the entry never outlives it
+        """
+        ttl = None if expires_at is None else expires_at - time.time()
+        self._tokens.set(self._token_key(token), user_id, ttl)
+
+    async def get_user(self, user_id: int) -> Optional[Dict]:
+        """Cached user snapshot, or None."""
+        redis = self._redis()
+        if redis is None:
+            return self._users.get(self._user_key(user_id))
+        try:
+            raw = await redis.get(self._user_key(user_id))
+        except Exception as e:
+            redis_failed(e)
+            return self._users.get(self._user_key(user_id))
+        if raw is None:
+            return None
+        snapshot = json.loads(raw)
+        for field in ("created_at", "updated_at"):
+            if snapshot.get(field):
+                snapshot[field] = datetime.fromisoformat(snapshot[field])
+        return snapshot
+
+    async def set_user(self, user) -> None:
+        """Store a snapshot of a User row."""
+        snapshot = {field: getattr(user, field) for field in self.SNAPSHOT_FIELDS}
+        redis = self._redis()
+        if redis is None:
+            self._users.set(self._user_key(user.id), snapshot)
+            return
+        try:
+            await redis.set(
+                self._user_key(user.id),
+                json.dumps(snapshot, default=lambda value: value.isoformat()),
+                ex=settings.AUTH_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            redis_failed(e)
+            self._users.set(self._user_key(user.id), snapshot)
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Drop a user's snapshot after its row changed."""
+        self._users.delete(self._user_key(user_id))
+        redis = self._redis()
+        if redis is not None:
+            try:
+                await redis.delete(self._user_key(user_id))
+            except Exception as e:
+                redis_failed(e)
+
+
+class ResponseCache:
+    """
+    Per-user cache of read-only API responses (the analytics dashboards).
+
+    Every key embeds the user's ``entries_version``, which is bumped in
+    the same transaction as each change to the user's entries (see
+    bump_entries_version), so a write orphans all of the user's cached
+    responses at once; orphans simply expire. Responses live in Redis
+    when RESPONSE_CACHE_REDIS is set, otherwise in-process; while Redis
+    is unreachable they are kept in-process too.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        """Singleton pattern."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._responses = TTLCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+            cls._instance.hits = defaultdict(int)
+            cls._instance.misses = defaultdict(int)
+        return cls._instance
+
+    def _redis(self):
+        return get_redis() if settings.RESPONSE_CACHE_REDIS else None
+
+    async def get(self, key: str) -> Optional[Any]:
+        redis = self._redis()
+        if redis is None:
+            return self._responses.get(key)
+        try:
+            raw = await redis.get(key)
+        except Exception as e:
+            redis_failed(e)
+            return self._responses.get(key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        redis = self._redis()
+        if redis is None:
+            self._responses.set(key, value)
+            return
+        try:
+            await redis.set(key, json.dumps(value), ex=settings.RESPONSE_CACHE_TTL_SECONDS)
+        except Exception as e:
+            redis_failed(e)
+            self._responses.set(key, value)
+
+    def metrics(self) -> Dict:
+        """Hit/miss counters of this process, per endpoint."""
+        endpoints = sorted(set(self.hits) | set(self.misses))
+        return {
+            "backend": "redis" if self._redis() is not None else "memory",
+            "size": len(self._responses),
+            "endpoints": {
+                name: {
+                    "hits": self.hits[name],
+                    "misses": self.misses[name],
+                    "hit_ratio": self.hits[name] / ((self.hits[name] + self.misses[name]) or 1)
+                }
+                for name in endpoints
+            },
+        }
+
+
+def bump_entries_version(db: Session, user_id: int):
+    """
+    Mark the user's entries as changed.
+
+    Call inside the transaction that changes them, so cached responses
+    and ETags can't be keyed on a version that misses the change.
+    """
+    db.info.pop(("entries_version", user_id), None)
+    db.execute(
+        update(User).where(User.id == user_id).values(
+            entries_version=User.entries_version + 1,
+            # Not a profile change, keep onupdate from touching it
+            updated_at=User.updated_at
+        ).execution_options(synchronize_session=False)
+    )
+
+
+async def get_entries_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Current value of the user's entries change counter.
+
+    Read once per session (i.e. per request), so the ETag dependency and
+    cached_response share the lookup; bump_entries_version forgets it.
+    """
+    key = ("entries_version", user_id)
+    if key not in db.info:
+        db.info[key] = await db.scalar(select(User.entries_version).where(User.id == user_id)) or 0
+    return db.info[key]
+
+
+def cached_response(name: str):
+    """
+    Cache an endpoint's JSON response in ResponseCache.
+
+    The endpoint must take ``current_user`` and ``db``; its other query
+    parameters (and today's date, for "this week"-style windows) become
+    part of the key.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            user = kwargs["current_user"]
+            cache = ResponseCache()
+            version = await get_entries_version(kwargs["db"], user.id)
+            params = {k: v for k, v in kwargs.items() if k not in ("current_user", "db")}
+            key = "cache:{}:v{}:{}:{}:{}".format(
+                user.id, version, name, datetime.utcnow().date().isoformat(),
+                json.dumps(params, sort_keys=True, default=str)
+            )
+            cached = await cache.get(key)
+            if cached is not None:
+                cache.hits[name] += 1
+                return cached
+
+            cache.misses[name] += 1
+            response = jsonable_encoder(await func(*args, **kwargs))
+            await cache.set(key, response)
+            return response
+        return wrapper
+    return decorator
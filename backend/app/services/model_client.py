@@ -0,0 +1,35 @@
+from multiprocessing.connection import Client
+from typing import Any
+import asyncio
+
+from app.config import settings
+
+
+class ModelServerError(RuntimeError):
+    """Raised when the model server reports a failure."""
+
+
+class ModelServerClient:
+    """
+    Client for the local model server (python -m app.model_server).
+    
+    Every call opens a short-lived connection on the Unix socket, so the
+    client is safe to share between tasks and threads.
+    """
+    
+    def __init__(self, address: str = None):
+        self.address = address or settings.MODEL_SERVER_SOCKET
+    
+    def call_sync(self, op: str, **kwargs) -> Any:
+        """Send one request and wait for its result."""
+        with Client(self.address, family="AF_UNIX", authkey=settings.SECRET_KEY.encode()) as conn:
+            conn.send((op, kwargs))
+            status, result = conn.recv()
+        
+        if status != "ok":
+            raise ModelServerError(result)
+        return result
+    
+    async def call(self, op: str, **kwargs) -> Any:
+        """Async wrapper around ``call_sync``."""
+        return await asyncio.to_thread(self.call_sync, op, **kwargs)
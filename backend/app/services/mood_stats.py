@@ -0,0 +1,117 @@
+"""
+Daily mood rollup maintenance.
+
+The analytics endpoints read ``daily_mood_stats`` instead of aggregating
+raw entries, so every write that changes an entry's day, mood, intensity
+or duration refreshes the affected days here, in the same transaction.
+
+Refreshes of one user are serialized on the user's row: otherwise two
+concurrent writes would each recompute a day without the other's
+uncommitted entry, and the last upsert would drop one of them.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import Date, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.entry import Entry
+from app.models.mood_stat import DailyMoodStat
+from app.models.user import User
+
+
+def _day_bounds(day: date):
+    """[start, end) datetimes of a UTC day."""
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def refresh_daily_mood_stats(db: Session, user_id: int, days: Iterable[Optional[date]]):
+    """
+    Recompute the rollup rows of the given days from their entries.
+
+    Only the affected days are touched, so the cost is bounded by the
+    number of entries on those days. Changes are flushed, not committed.
+
+    Args:
+        db: Database session
+        user_id: Owner of the entries
+        days: Days to refresh (None values are ignored)
+    """
+    # Sessions don't autoflush; make pending entry changes visible
+    db.flush()
+    # Held until commit. NO KEY UPDATE doesn't conflict with the KEY SHARE
+    # lock the entry's foreign key already holds on the row.
+    db.execute(select(User.id).where(User.id == user_id).with_for_update(key_share=True))
+    for day in {d for d in days if d is not None}:
+        start, end = _day_bounds(day)
+        rows = db.query(
+            Entry.mood, Entry.mood_intensity, Entry.duration_seconds
+        ).filter(
+            Entry.user_id == user_id,
+            Entry.recorded_at >= start,
+            Entry.recorded_at < end
+        ).order_by(Entry.recorded_at, Entry.id).all()
+
+        if not rows:
+            db.query(DailyMoodStat).filter(
+                DailyMoodStat.user_id == user_id,
+                DailyMoodStat.date == day
+            ).delete(synchronize_session=False)
+            continue
+
+        mood_counts = {}
+        intensity_sums = {}
+        dominant_mood = None
+        dominant_intensity = None
+        for mood, intensity, _ in rows:
+            if mood is None:
+                continue
+            intensity = intensity or 5
+            mood_counts[mood.value] = mood_counts.get(mood.value, 0) + 1
+            intensity_sums[mood.value] = intensity_sums.get(mood.value, 0) + intensity
+            if dominant_intensity is None or intensity > dominant_intensity:
+                dominant_mood, dominant_intensity = mood.value, intensity
+
+        values = {
+            "entry_count": len(rows),
+            "duration_seconds": sum(duration or 0 for _, _, duration in rows),
+            "mood_counts": mood_counts,
+            "intensity_sums": intensity_sums,
+            "dominant_mood": dominant_mood,
+            "dominant_intensity": dominant_intensity,
+            "updated_at": datetime.utcnow(),
+        }
+        db.execute(
+            insert(DailyMoodStat)
+            .values(user_id=user_id, date=day, **values)
+            .on_conflict_do_update(constraint="uq_daily_mood_stats_user_date", set_=values)
+        )
+    db.flush()
+
+
+def rebuild_daily_mood_stats(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild the rollup from scratch, e.g. after a backfill.
+
+    Args:
+        db: Database session
+        user_id: Only rebuild this user's rows
+
+    Returns:
+        Number of days refreshed
+    """
+    stats = db.query(DailyMoodStat)
+    days = db.query(Entry.user_id, func.date(Entry.recorded_at, type_=Date)).distinct()
+    if user_id is not None:
+        stats = stats.filter(DailyMoodStat.user_id == user_id)
+        days = days.filter(Entry.user_id == user_id)
+    stats.delete(synchronize_session=False)
+
+    count = 0
+    for owner_id, day in days.all():
+        refresh_daily_mood_stats(db, owner_id, [day])
+        count += 1
+    db.commit()
+    return count
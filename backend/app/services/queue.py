@@ -0,0 +1,177 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, and_
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config import settings
+from app.models.job import ProcessingJob, JobStatus
+
+
+class JobLostError(Exception):
+    """The worker's claim on a job expired and another worker took it over."""
+
+
+class JobQueue:
+    """
+    Durable processing queue stored in Postgres.
+
+    Workers claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` so any
+    number of worker processes can poll the same table without handing
+    out a job twice. A claimed job is invisible to other workers until
+    ``locked_until``; if the worker dies, the job becomes claimable again
+    once that visibility timeout has passed. State changes after the claim
+    only apply while the job is still locked by the same worker.
+    """
+
+    # Pipeline stages, in order. Each stage is retried independently.
+    STAGES = ["media", "transcribe", "analyze"]
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, entry_id: int) -> ProcessingJob:
+        """
+        Add a processing job for an entry.
+
+        The job is only added to the session; it becomes visible to
+        workers when the caller commits.
+        """
+        job = ProcessingJob(
+            entry_id=entry_id,
+            stage=self.STAGES[0],
+            status=JobStatus.PENDING,
+            attempts=0,
+            run_after=datetime.utcnow()
+        )
+        self.db.add(job)
+        return job
+
+    def claim(self, worker_id: str) -> Optional[ProcessingJob]:
+        """
+        Claim the next runnable job.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            The claimed job, or None if nothing is runnable
+        """
+        while True:
+            now = datetime.utcnow()
+            job = self.db.query(ProcessingJob).filter(
+                or_(
+                    and_(ProcessingJob.status == JobStatus.PENDING, ProcessingJob.run_after <= now),
+                    # Visibility timeout expired: the previous worker is gone
+                    and_(ProcessingJob.status == JobStatus.RUNNING, ProcessingJob.locked_until < now)
+                )
+            ).order_by(ProcessingJob.id).with_for_update(skip_locked=True).first()
+
+            if not job:
+                self.db.commit()
+                return None
+
+            job.attempts = (job.attempts or 0) + 1
+            if job.attempts > settings.JOB_MAX_ATTEMPTS:
+                # Stage kept timing out without ever reporting a failure
+                job.status = JobStatus.FAILED
+                job.last_error = job.last_error or "Visibility timeout exceeded"
+                job.locked_until = None
+                job.locked_by = None
+                self.db.commit()
+                continue
+
+            job.status = JobStatus.RUNNING
+            job.locked_by = worker_id
+            job.locked_until = now + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS)
+            self.db.commit()
+            return job
+
+    def _update_owned(self, job_id: int, worker_id: str, **values):
+        """
+        Update a running job only while ``worker_id`` still holds it.
+
+        A worker that overran the visibility timeout may have lost the job
+        to another worker; its late updates must not overwrite the new
+        owner's progress.
+
+        Raises:
+            JobLostError: The job was reclaimed by another worker
+        """
+        updated = self.db.query(ProcessingJob).filter(
+            ProcessingJob.id == job_id,
+            ProcessingJob.status == JobStatus.RUNNING,
+            ProcessingJob.locked_by == worker_id
+        ).update(values, synchronize_session=False)
+        if not updated:
+            self.db.rollback()
+            raise JobLostError(f"Job {job_id} is no longer held by {worker_id}")
+
+    def heartbeat(self, job_id: int, worker_id: str):
+        """Extend the visibility timeout of a running job and commit."""
+        self._update_owned(
+            job_id, worker_id,
+            locked_until=datetime.utcnow() + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS)
+        )
+        self.db.commit()
+
+    def advance(self, job: ProcessingJob, worker_id: str) -> bool:
+        """
+        Mark the current stage as completed and commit.
+
+        Changes pending in the session (the stage's results) are committed
+        together with the job's progress, or discarded if the job was lost.
+
+        Returns:
+            True if there is another stage to run, False if the job is done
+        """
+        job_id = job.id
+        index = self.STAGES.index(job.stage)
+
+        if index + 1 < len(self.STAGES):
+            # The next stage starts right away in this claim: its first attempt
+            self._update_owned(
+                job_id, worker_id,
+                stage=self.STAGES[index + 1],
+                attempts=1,
+                last_error=None,
+                locked_until=datetime.utcnow() + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS)
+            )
+            self.db.commit()
+            return True
+
+        self._update_owned(
+            job_id, worker_id,
+            status=JobStatus.DONE,
+            attempts=0,
+            last_error=None,
+            locked_until=None,
+            locked_by=None
+        )
+        self.db.commit()
+        return False
+
+    def fail(self, job: ProcessingJob, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt of the current stage and commit.
+
+        Returns:
+            True if the stage will be retried, False if the job gave up
+        """
+        job_id = job.id
+        attempts = job.attempts or 0
+        values = dict(last_error=error[:2000], locked_until=None, locked_by=None)
+
+        if attempts < settings.JOB_MAX_ATTEMPTS:
+            # Linear backoff between retries
+            self._update_owned(
+                job_id, worker_id,
+                status=JobStatus.PENDING,
+                run_after=datetime.utcnow() + timedelta(seconds=settings.JOB_RETRY_BACKOFF_SECONDS * attempts),
+                **values
+            )
+            self.db.commit()
+            return True
+
+        self._update_owned(job_id, worker_id, status=JobStatus.FAILED, **values)
+        self.db.commit()
+        return False
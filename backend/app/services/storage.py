@@ -1,13 +1,23 @@
+import asyncio
 import boto3
 from botocore.client import Config
 import tempfile
+import inspect
 import os
-from typing import Optional
+from typing import Optional, Tuple, BinaryIO
 from app.config import settings
 
+# S3 rejects multipart parts smaller than 5 MB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
 
 class StorageService:
-    """MinIO/S3 compatible storage service for video files."""
+    """
+    MinIO/S3 compatible storage service for video files.
+    
+    boto3 is blocking, so network calls made from the async methods run
+    in a thread (``asyncio.to_thread``) instead of on the event loop.
+    """
     
     def __init__(self):
         self.client = boto3.client(
@@ -43,17 +53,120 @@ class StorageService:
         Returns:
             Public URL of the uploaded file
         """
-        self.client.put_object(
+        await asyncio.to_thread(
+            self.client.put_object,
             Bucket=self.bucket,
             Key=key,
             Body=data,
             ContentType=content_type
         )
         
-        # Generate URL
-        url = f"http{'s' if settings.MINIO_SECURE else ''}://{settings.MINIO_ENDPOINT}/{self.bucket}/{key}"
-        return url
-    
+        return self._public_url(key)
+
+    async def upload_stream(
+        self,
+        key: str,
+        stream: BinaryIO,
+        content_type: str,
+        part_size: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """
+        Upload a file-like object to storage in fixed-size parts.
+
+        Only one part is held in memory at a time, so peak memory per
+        upload is bounded by ``part_size`` regardless of the file size.
+        Small files (a single part) are sent with a plain ``put_object``.
+
+        Args:
+            key: Object key (path in bucket)
+            stream: Object with an ``async read(size)`` (e.g. ``UploadFile``)
+                or a regular blocking ``read(size)`` method
+            content_type: MIME type
+            part_size: Part size in bytes (S3 minimum is 5 MB)
+
+        Returns:
+            Tuple of (public URL, total uploaded size in bytes)
+        """
+        part_size = max(part_size or settings.UPLOAD_PART_SIZE_MB * 1024 * 1024, MIN_PART_SIZE)
+
+        first_part = await self._read_part(stream, part_size)
+        if len(first_part) < part_size:
+            # Whole file fits in one part, no need for a multipart upload
+            await asyncio.to_thread(
+                self.client.put_object,
+                Bucket=self.bucket,
+                Key=key,
+                Body=first_part,
+                ContentType=content_type
+            )
+            return self._public_url(key), len(first_part)
+
+        upload = await asyncio.to_thread(
+            self.client.create_multipart_upload,
+            Bucket=self.bucket,
+            Key=key,
+            ContentType=content_type
+        )
+        upload_id = upload["UploadId"]
+        parts = []
+        total_size = 0
+
+        try:
+            part_number = 1
+            chunk = first_part
+            while chunk:
+                response = await asyncio.to_thread(
+                    self.client.upload_part,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+                total_size += len(chunk)
+                part_number += 1
+                chunk = await self._read_part(stream, part_size)
+
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            # Don't leave orphaned parts behind in the bucket
+            try:
+                await asyncio.to_thread(
+                    self.client.abort_multipart_upload,
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id
+                )
+            except Exception as e:
+                print(f"Could not abort multipart upload {upload_id}: {e}")
+            raise
+
+        return self._public_url(key), total_size
+
+    @staticmethod
+    async def _read_part(stream, size: int) -> bytes:
+        """Read up to ``size`` bytes, filling the part across short reads."""
+        buffer = bytearray()
+        while len(buffer) < size:
+            data = stream.read(size - len(buffer))
+            if inspect.isawaitable(data):
+                data = await data
+            if not data:
+                break
+            buffer.extend(data)
+        return bytes(buffer)
+
+    def _public_url(self, key: str) -> str:
+        """Build the public URL of an object."""
+        return f"http{'s' if settings.MINIO_SECURE else ''}://{settings.MINIO_ENDPOINT}/{self.bucket}/{key}"
+
     async def get_presigned_url(self, key: str, expires_in: int = 3600) -> str:
         """
         Get a presigned URL for temporary access.
@@ -82,15 +195,13 @@ class StorageService:
         Returns:
             Path to temporary file
         """
-        response = self.client.get_object(Bucket=self.bucket, Key=key)
-        
         # Determine extension from key
         ext = key.split(".")[-1] if "." in key else "bin"
-        
-        # Create temp file
+
+        # Create temp file and stream the object into it
         fd, temp_path = tempfile.mkstemp(suffix=f".{ext}")
         with os.fdopen(fd, "wb") as f:
-            f.write(response["Body"].read())
+            await asyncio.to_thread(self.client.download_fileobj, self.bucket, key, f)
         
         return temp_path
     
@@ -105,7 +216,7 @@ class StorageService:
             True if deleted successfully
         """
         try:
-            self.client.delete_object(Bucket=self.bucket, Key=key)
+            await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
             return True
         except Exception as e:
             print(f"Error deleting file: {e}")
@@ -121,7 +232,8 @@ class StorageService:
         Returns:
             List of object keys
         """
-        response = self.client.list_objects_v2(
+        response = await asyncio.to_thread(
+            self.client.list_objects_v2,
             Bucket=self.bucket,
             Prefix=prefix
         )
@@ -0,0 +1,179 @@
+"""
+Streak bookkeeping on the User record.
+
+``current_streak`` is the run of consecutive days ending at
+``last_entry_date``; it is only "live" while that day is today or
+yesterday (see ``live_streak``). Adding an entry on the latest day or the
+day after is O(1). Back-dated entries, deletions and ``recorded_at`` edits
+walk the daily rollup around the affected day, so they cost the length of
+the runs next to it, not the whole history.
+
+Call these after ``refresh_daily_mood_stats`` so the rollup reflects the
+change.
+"""
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.mood_stat import DailyMoodStat
+
+# Days fetched per query when walking a run
+WALK_CHUNK_DAYS = 64
+
+
+def live_streak(user: User, today: date) -> int:
+    """
+    Current streak as shown to the user (0 once a day was skipped).
+
+    ``user`` may also be a result row with the streak columns.
+    """
+    if user.last_entry_date is None or user.last_entry_date < today - timedelta(days=1):
+        return 0
+    return user.current_streak or 0
+
+
+def _has_entries(db: Session, user_id: int, day: date) -> bool:
+    return db.query(DailyMoodStat.id).filter(
+        DailyMoodStat.user_id == user_id,
+        DailyMoodStat.date == day
+    ).first() is not None
+
+
+def _walk(db: Session, user_id: int, day: date, step: int) -> int:
+    """Count consecutive days with entries next to ``day`` (excluded), going ``step`` (+1/-1)."""
+    count = 0
+    while True:
+        first = day + timedelta(days=step * (count + 1))
+        last = first + timedelta(days=step * (WALK_CHUNK_DAYS - 1))
+        low, high = min(first, last), max(first, last)
+        found = {d for (d,) in db.query(DailyMoodStat.date).filter(
+            DailyMoodStat.user_id == user_id,
+            DailyMoodStat.date >= low,
+            DailyMoodStat.date <= high
+        )}
+        for _ in range(WALK_CHUNK_DAYS):
+            if day + timedelta(days=step * (count + 1)) not in found:
+                return count
+            count += 1
+
+
+def _longest_run(db: Session, user_id: int) -> int:
+    """Longest run of consecutive days over the whole history."""
+    longest = run = 0
+    previous = None
+    for (day,) in db.query(DailyMoodStat.date).filter(
+        DailyMoodStat.user_id == user_id
+    ).order_by(DailyMoodStat.date):
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+    return longest
+
+
+def _lock_user(db: Session, user_id: int) -> User:
+    """
+    Load the user row with a lock so concurrent writes don't lose updates.
+
+    populate_existing: the request's user object may have been loaded
+    before the lock was taken, so its streak columns could be stale.
+    NO KEY UPDATE, like the rollup refresh: a plain FOR UPDATE conflicts
+    with the KEY SHARE lock of a just-inserted entry's foreign key, so
+    two concurrent inserts for one user would deadlock.
+    """
+    return db.query(User).filter(User.id == user_id).with_for_update(key_share=True).populate_existing().one()
+
+
+def record_entry_day(db: Session, user_id: int, day: date):
+    """
+    Update streaks after an entry was added on (or moved to) ``day``.
+
+    Args:
+        db: Database session
+        user_id: Owner of the entry
+        day: Day of the entry's recorded_at
+    """
+    user = _lock_user(db, user_id)
+    last = user.last_entry_date
+    current = user.current_streak or 0
+
+    if last is None or day > last + timedelta(days=1):
+        user.current_streak = 1
+        user.last_entry_date = day
+    elif day == last + timedelta(days=1):
+        user.current_streak = current + 1
+        user.last_entry_date = day
+    elif day < last and day <= last - timedelta(days=current):
+        # Back-dated outside the current run: may join runs around it
+        before = _walk(db, user_id, day, -1)
+        after = _walk(db, user_id, day, 1)
+        if day + timedelta(days=after) == last:
+            user.current_streak = before + 1 + after
+        user.longest_streak = max(user.longest_streak or 0, before + 1 + after)
+    # Otherwise the day is already part of the current run
+
+    user.longest_streak = max(user.longest_streak or 0, user.current_streak or 0)
+
+
+def remove_entry_day(db: Session, user_id: int, day: Optional[date]):
+    """
+    Update streaks after an entry was deleted from (or moved off) ``day``.
+
+    Nothing changes while the day still has other entries.
+
+    Args:
+        db: Database session
+        user_id: Owner of the entry
+        day: Previous day of the entry's recorded_at
+    """
+    if day is None or _has_entries(db, user_id, day):
+        return
+
+    user = _lock_user(db, user_id)
+    last = user.last_entry_date
+    before = _walk(db, user_id, day, -1)
+    after = _walk(db, user_id, day, 1)
+
+    if last is not None and day == last:
+        # Latest day removed: the run before it becomes the current one
+        latest = db.query(DailyMoodStat.date).filter(
+            DailyMoodStat.user_id == user_id
+        ).order_by(DailyMoodStat.date.desc()).first()
+        user.last_entry_date = latest[0] if latest else None
+        user.current_streak = (1 + _walk(db, user_id, latest[0], -1)) if latest else 0
+    elif last is not None and day > last - timedelta(days=user.current_streak or 0):
+        # Split the current run, keep the part after the removed day
+        user.current_streak = after
+
+    if before + 1 + after >= (user.longest_streak or 0):
+        # The removed day may have been part of the longest run
+        user.longest_streak = _longest_run(db, user_id)
+
+
+def repair_streaks(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild streak columns from the daily rollup.
+
+    Args:
+        db: Database session
+        user_id: Only repair this user
+
+    Returns:
+        Number of users repaired
+    """
+    users = db.query(User)
+    if user_id is not None:
+        users = users.filter(User.id == user_id)
+
+    count = 0
+    for user in users.all():
+        latest = db.query(DailyMoodStat.date).filter(
+            DailyMoodStat.user_id == user.id
+        ).order_by(DailyMoodStat.date.desc()).first()
+        user.last_entry_date = latest[0] if latest else None
+        user.current_streak = (1 + _walk(db, user.id, latest[0], -1)) if latest else 0
+        user.longest_streak = _longest_run(db, user.id)
+        db.commit()
+        count += 1
+    return count
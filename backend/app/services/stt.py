@@ -1,5 +1,13 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, Union, Any
+import asyncio
+import io
+import time
+import wave
 from app.config import settings
+from app.services.model_client import ModelServerClient
+
+# Audio input: path to a file, or float32 16 kHz mono samples (NumPy array)
+AudioInput = Union[str, Any]
 
 
 class SpeechToText:
@@ -21,16 +29,23 @@ class SpeechToText:
             self._model = whisper.load_model(settings.WHISPER_MODEL)
         return self._model
     
+    def warmup(self):
+        """Load the model and run one short inference to prime it."""
+        import numpy as np
+        model = self._load_model()
+        model.transcribe(np.zeros(16000, dtype=np.float32), language="tr", verbose=None)
+    
     async def transcribe(
         self,
-        audio_path: str,
+        audio: AudioInput,
         language: str = "tr"
     ) -> Dict:
         """
         Transcribe audio to text using OpenAI Whisper.
         
         Args:
-            audio_path: Path to audio file (wav, mp3, etc.)
+            audio: Path to audio file (wav, mp3, etc.) or float32 16 kHz
+                mono samples, which skip Whisper's own ffmpeg decode
             language: Language code (tr for Turkish)
             
         Returns:
@@ -39,8 +54,10 @@ class SpeechToText:
         try:
             model = self._load_model()
             
-            result = model.transcribe(
-                audio_path,
+            # Inference is CPU bound, keep it off the event loop
+            result = await asyncio.to_thread(
+                model.transcribe,
+                audio,
                 language=language,
                 task="transcribe",
                 verbose=False
@@ -60,12 +77,12 @@ class SpeechToText:
                 "error": str(e)
             }
     
-    async def detect_language(self, audio_path: str) -> str:
+    async def detect_language(self, audio: AudioInput) -> str:
         """
         Detect the language of the audio.
         
         Args:
-            audio_path: Path to audio file
+            audio: Path to audio file or float32 16 kHz mono samples
             
         Returns:
             Detected language code
@@ -75,7 +92,8 @@ class SpeechToText:
             
             # Load audio and pad/trim to 30 seconds
             import whisper
-            audio = whisper.load_audio(audio_path)
+            if isinstance(audio, str):
+                audio = whisper.load_audio(audio)
             audio = whisper.pad_or_trim(audio)
             
             # Make log-Mel spectrogram
@@ -91,16 +109,284 @@ class SpeechToText:
             return "tr"  # Default to Turkish
 
 
+class BatchTranscriber:
+    """
+    Batched Whisper transcription across many entries.
+    
+    Audio from every caller is cut into 30-second windows (Whisper's
+    native input size). A collector task gathers pending windows until
+    ``max_batch_size`` is reached or ``max_wait_ms`` has passed, decodes
+    them as one mel batch and routes each result back to its entry.
+    
+    Windows are cut at fixed offsets, so a word spanning a boundary may
+    be split; in exchange CPU throughput is much higher than running
+    ``model.transcribe`` file by file.
+    """
+    
+    _instance = None
+    
+    WINDOW_SECONDS = 30
+    SAMPLE_RATE = 16000
+    
+    def __new__(cls):
+        """Singleton pattern so all entries share one batching queue."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._queue = None
+            cls._instance._collector = None
+        return cls._instance
+    
+    @property
+    def max_batch_size(self) -> int:
+        return max(1, settings.STT_BATCH_SIZE)
+    
+    @property
+    def max_wait(self) -> float:
+        return settings.STT_BATCH_MAX_WAIT_MS / 1000
+    
+    def warmup(self):
+        """Batches run on the shared Whisper model, warm that one up."""
+        SpeechToText().warmup()
+    
+    async def detect_language(self, audio: AudioInput) -> str:
+        """
+        Detect the language of the audio.
+        
+        A single 30-second window, so it isn't worth batching; runs on
+        the shared Whisper model.
+        
+        Args:
+            audio: Path to audio file or float32 16 kHz mono samples
+            
+        Returns:
+            Detected language code
+        """
+        return await SpeechToText().detect_language(audio)
+    
+    def _ensure_collector(self):
+        """Start the collector task on first use."""
+        if self._collector is None or self._collector.done():
+            self._queue = asyncio.Queue()
+            self._collector = asyncio.create_task(self._collect())
+    
+    async def transcribe(
+        self,
+        audio: AudioInput,
+        language: str = "tr"
+    ) -> Dict:
+        """
+        Transcribe audio to text, batched with other pending requests.
+        
+        Args:
+            audio: Path to audio file or float32 16 kHz mono samples
+            language: Language code (tr for Turkish)
+            
+        Returns:
+            Dictionary with text, segments (one per window), and language
+        """
+        try:
+            if isinstance(audio, str):
+                import whisper
+                audio = await asyncio.to_thread(whisper.load_audio, audio)
+            
+            window = self.WINDOW_SECONDS * self.SAMPLE_RATE
+            offsets = list(range(0, len(audio), window))
+            
+            self._ensure_collector()
+            loop = asyncio.get_running_loop()
+            futures = []
+            for offset in offsets:
+                future = loop.create_future()
+                await self._queue.put((audio[offset:offset + window], language, future))
+                futures.append(future)
+            
+            texts = await asyncio.gather(*futures)
+            
+            duration = len(audio) / self.SAMPLE_RATE
+            segments = [
+                {
+                    "id": i,
+                    "start": offset / self.SAMPLE_RATE,
+                    "end": min((offset + window) / self.SAMPLE_RATE, duration),
+                    "text": text
+                }
+                for i, (offset, text) in enumerate(zip(offsets, texts))
+                if text
+            ]
+            
+            return {
+                "text": " ".join(segment["text"] for segment in segments),
+                "segments": segments,
+                "language": language
+            }
+        except Exception as e:
+            print(f"Batch transcription error: {e}")
+            return {
+                "text": "",
+                "segments": [],
+                "language": language,
+                "error": str(e)
+            }
+    
+    async def _collect(self):
+        """Gather windows into batches and decode them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Decoding options are per batch, so group by language
+            by_language = {}
+            for item in batch:
+                by_language.setdefault(item[1], []).append(item)
+            
+            for language, items in by_language.items():
+                try:
+                    texts = await asyncio.to_thread(
+                        self._decode_batch, [item[0] for item in items], language
+                    )
+                    for (_, _, future), text in zip(items, texts):
+                        if not future.done():
+                            future.set_result(text)
+                except Exception as e:
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+    
+    def _decode_batch(self, windows: list, language: str) -> list:
+        """Run one batched decode over a list of 30-second windows."""
+        import torch
+        import whisper
+        
+        model = SpeechToText()._load_model()
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(window), model.dims.n_mels)
+            for window in windows
+        ]).to(model.device)
+        
+        options = whisper.DecodingOptions(
+            language=language,
+            task="transcribe",
+            without_timestamps=True,
+            fp16=model.device.type == "cuda"
+        )
+        results = whisper.decode(model, mel, options)
+        return [result.text.strip() for result in results]
+
+
+class FasterWhisperSpeechToText:
+    """CTranslate2 (faster-whisper) backend, int8 quantized for CPU nodes."""
+    
+    _instance = None
+    _model = None
+    
+    def __new__(cls):
+        """Singleton pattern to avoid loading model multiple times."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    def _load_model(self):
+        """Lazy load the CTranslate2 Whisper model."""
+        if self._model is None:
+            from faster_whisper import WhisperModel
+            self._model = WhisperModel(
+                settings.WHISPER_MODEL,
+                device=settings.STT_DEVICE,
+                compute_type=settings.STT_COMPUTE_TYPE,
+                cpu_threads=settings.STT_CPU_THREADS
+            )
+        return self._model
+    
+    def warmup(self):
+        """Load the model and run one short inference to prime it."""
+        import numpy as np
+        segments, _ = self._load_model().transcribe(np.zeros(16000, dtype=np.float32), language="tr")
+        list(segments)
+    
+    async def transcribe(
+        self,
+        audio: AudioInput,
+        language: str = "tr"
+    ) -> Dict:
+        """
+        Transcribe audio to text using faster-whisper.
+        
+        Args:
+            audio: Path to audio file or float32 16 kHz mono samples
+            language: Language code (tr for Turkish)
+            
+        Returns:
+            Dictionary with text, segments, and language
+        """
+        try:
+            model = self._load_model()
+            
+            def run():
+                segments, info = model.transcribe(audio, language=language, task="transcribe")
+                # Segments are generated lazily, decode them in this thread
+                return [
+                    {"id": i, "start": seg.start, "end": seg.end, "text": seg.text.strip()}
+                    for i, seg in enumerate(segments)
+                ], info
+            
+            segments, info = await asyncio.to_thread(run)
+            
+            return {
+                "text": " ".join(seg["text"] for seg in segments).strip(),
+                "segments": segments,
+                "language": info.language or language
+            }
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            return {
+                "text": "",
+                "segments": [],
+                "language": language,
+                "error": str(e)
+            }
+    
+    async def detect_language(self, audio: AudioInput) -> str:
+        """
+        Detect the language of the audio.
+        
+        Args:
+            audio: Path to audio file or float32 16 kHz mono samples
+            
+        Returns:
+            Detected language code
+        """
+        try:
+            model = self._load_model()
+            # Language is detected up front; segments are never decoded
+            _, info = await asyncio.to_thread(model.transcribe, audio)
+            return info.language
+        except Exception as e:
+            print(f"Language detection error: {e}")
+            return "tr"  # Default to Turkish
+
+
 # Alternative implementation using OpenAI API (if Whisper model is too heavy)
 class SpeechToTextAPI:
     """OpenAI API-based speech-to-text (alternative to local Whisper)."""
     
     def __init__(self, api_key: Optional[str] = None):
-        self.api_key = api_key
+        self.api_key = api_key or settings.OPENAI_API_KEY
+    
+    def warmup(self):
+        """Nothing to load for the API backend."""
     
     async def transcribe(
         self,
-        audio_path: str,
+        audio: AudioInput,
         language: str = "tr"
     ) -> Dict:
         """
@@ -113,7 +399,7 @@ class SpeechToTextAPI:
             
             client = OpenAI(api_key=self.api_key)
             
-            with open(audio_path, "rb") as audio_file:
+            with self._open_audio(audio) as audio_file:
                 transcript = client.audio.transcriptions.create(
                     model="whisper-1",
                     file=audio_file,
@@ -134,3 +420,115 @@ class SpeechToTextAPI:
                 "language": language,
                 "error": str(e)
             }
+    
+    @staticmethod
+    def _open_audio(audio: AudioInput):
+        """Open a file path, or wrap in-memory samples as a WAV upload."""
+        if isinstance(audio, str):
+            return open(audio, "rb")
+        
+        import numpy as np
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(pcm.tobytes())
+        buffer.seek(0)
+        buffer.name = "audio.wav"
+        return buffer
+
+
+class RemoteSpeechToText:
+    """
+    Speech-to-text through the shared local model server.
+    
+    The model weights live in a single model server process, so API and
+    worker processes don't each hold their own copy.
+    """
+    
+    def __init__(self):
+        self.client = ModelServerClient()
+    
+    def warmup(self):
+        """
+        Wait until the model server answers.
+        
+        The server only listens once its own models are loaded, so the
+        socket may be missing or refuse connections for a while after
+        both processes start. Retries until MODEL_SERVER_WAIT_SECONDS.
+        """
+        deadline = time.monotonic() + settings.MODEL_SERVER_WAIT_SECONDS
+        while True:
+            try:
+                self.client.call_sync("ping")
+                return
+            except OSError as e:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        f"Model server at {self.client.address} not reachable "
+                        f"after {settings.MODEL_SERVER_WAIT_SECONDS}s: {e}"
+                    ) from e
+                time.sleep(1)
+    
+    async def transcribe(
+        self,
+        audio: AudioInput,
+        language: str = "tr"
+    ) -> Dict:
+        """
+        Transcribe audio on the model server.
+        
+        Args:
+            audio: Path to audio file or float32 16 kHz mono samples
+            language: Language code (tr for Turkish)
+            
+        Returns:
+            Dictionary with text, segments, and language
+        """
+        try:
+            return await self.client.call("transcribe", audio=audio, language=language)
+        except Exception as e:
+            print(f"Remote transcription error: {e}")
+            return {
+                "text": "",
+                "segments": [],
+                "language": language,
+                "error": str(e)
+            }
+    
+    async def detect_language(self, audio: AudioInput) -> str:
+        """Detect the language of the audio on the model server."""
+        try:
+            return await self.client.call("detect_language", audio=audio)
+        except Exception as e:
+            print(f"Remote language detection error: {e}")
+            return "tr"  # Default to Turkish
+
+
+# Backends selectable with STT_BACKEND
+STT_BACKENDS = {
+    "whisper": SpeechToText,
+    "faster-whisper": FasterWhisperSpeechToText,
+    "api": SpeechToTextAPI,
+    "remote": RemoteSpeechToText,
+}
+
+
+def get_stt(backend: Optional[str] = None):
+    """
+    Get a speech-to-text backend, STT_BACKEND by default.
+    
+    All backends share the ``transcribe``/``detect_language`` contract.
+    """
+    backend = backend or settings.STT_BACKEND
+    if backend not in STT_BACKENDS:
+        raise ValueError(
+            f"Unknown STT backend '{backend}', expected one of: {', '.join(STT_BACKENDS)}"
+        )
+    
+    if backend == "whisper" and settings.STT_BATCHING:
+        return BatchTranscriber()
+    
+    return STT_BACKENDS[backend]()
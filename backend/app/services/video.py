@@ -1,18 +1,86 @@
+import asyncio
 import subprocess
 import tempfile
 import os
 import json
-from typing import Optional
+import re
+from typing import Optional, List, Tuple, Dict
+from app.config import settings
 
 
 class VideoProcessor:
     """FFmpeg-based video processing service."""
     
+    _semaphore = None
+    
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """Limit the number of concurrent ffmpeg/ffprobe processes."""
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(settings.FFMPEG_CONCURRENCY)
+        return cls._semaphore
+    
+    @classmethod
+    async def _run(
+        cls,
+        cmd: List[str],
+        timeout: Optional[float] = None,
+        check: bool = True
+    ) -> Tuple[bytes, bytes]:
+        """
+        Run a command without blocking the event loop.
+        
+        The child process is killed if the timeout expires or the calling
+        task is cancelled, so no orphaned ffmpeg keeps running.
+        
+        Args:
+            cmd: Command and arguments
+            timeout: Timeout in seconds (defaults to FFMPEG_TIMEOUT_SECONDS)
+            check: Raise CalledProcessError on a non-zero exit code
+            
+        Returns:
+            Tuple of (stdout, stderr)
+        """
+        timeout = timeout or settings.FFMPEG_TIMEOUT_SECONDS
+        
+        async with cls._get_semaphore():
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                await cls._kill(process)
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            except BaseException:
+                # Cancelled: don't leave the child running
+                await cls._kill(process)
+                raise
+        
+        if check and process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+        return stdout, stderr
+    
     @staticmethod
+    async def _kill(process: asyncio.subprocess.Process):
+        """Kill a child process and reap it."""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+    
+    @classmethod
     async def compress_video(
+        cls,
         input_path: str,
         output_path: Optional[str] = None,
-        quality: str = "medium"
+        quality: str = "medium",
+        timeout: Optional[float] = None
     ) -> str:
         """
         Compress video using FFmpeg with H.264 codec.
@@ -21,6 +89,7 @@ class VideoProcessor:
             input_path: Path to input video
             output_path: Path for output video (optional)
             quality: Quality preset (low, medium, high)
+            timeout: Command timeout in seconds (optional)
             
         Returns:
             Path to compressed video
@@ -45,15 +114,17 @@ class VideoProcessor:
             output_path
         ]
         
-        subprocess.run(cmd, check=True, capture_output=True)
+        await cls._run(cmd, timeout=timeout)
         return output_path
     
-    @staticmethod
+    @classmethod
     async def generate_thumbnail(
+        cls,
         video_path: str,
         output_path: Optional[str] = None,
         timestamp: float = 1.0,
-        width: int = 480
+        width: int = 480,
+        timeout: Optional[float] = None
     ) -> str:
         """
         Extract thumbnail from video at specified timestamp.
@@ -63,6 +134,7 @@ class VideoProcessor:
             output_path: Path for output image (optional)
             timestamp: Time in seconds to extract frame
             width: Output width (height auto-scaled)
+            timeout: Command timeout in seconds (optional)
             
         Returns:
             Path to thumbnail image
@@ -81,16 +153,17 @@ class VideoProcessor:
             output_path
         ]
         
-        subprocess.run(cmd, check=True, capture_output=True)
+        await cls._run(cmd, timeout=timeout)
         return output_path
     
-    @staticmethod
-    async def get_duration(video_path: str) -> float:
+    @classmethod
+    async def get_duration(cls, video_path: str, timeout: Optional[float] = None) -> float:
         """
         Get video duration in seconds.
         
         Args:
             video_path: Path to video file
+            timeout: Command timeout in seconds (optional)
             
         Returns:
             Duration in seconds
@@ -103,16 +176,18 @@ class VideoProcessor:
             video_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        data = json.loads(result.stdout)
+        stdout, _ = await cls._run(cmd, timeout=timeout, check=False)
+        data = json.loads(stdout or b"{}")
         
         return float(data.get("format", {}).get("duration", 0))
     
-    @staticmethod
+    @classmethod
     async def extract_audio(
+        cls,
         video_path: str,
         output_path: Optional[str] = None,
-        format: str = "wav"
+        format: str = "wav",
+        timeout: Optional[float] = None
     ) -> str:
         """
         Extract audio track from video.
@@ -121,6 +196,7 @@ class VideoProcessor:
             video_path: Path to video file
             output_path: Path for output audio (optional)
             format: Audio format (wav, mp3, etc.)
+            timeout: Command timeout in seconds (optional)
             
         Returns:
             Path to audio file
@@ -140,15 +216,188 @@ class VideoProcessor:
             output_path
         ]
         
-        subprocess.run(cmd, check=True, capture_output=True)
+        await cls._run(cmd, timeout=timeout)
         return output_path
     
+    @classmethod
+    async def extract_audio_pcm(cls, video_path: str, timeout: Optional[float] = None):
+        """
+        Decode the audio track straight into memory for Whisper.
+        
+        ffmpeg streams raw 16 kHz mono s16le PCM over a pipe, so there is
+        no temp WAV file and Whisper does not have to decode it again.
+        
+        Args:
+            video_path: Path to video file
+            timeout: Command timeout in seconds (optional)
+            
+        Returns:
+            NumPy float32 array of samples in [-1, 1], empty if the file
+            has no audio track
+        """
+        cmd = [
+            "ffmpeg",
+            "-nostdin",
+            "-i", video_path,
+            "-map", "0:a:0?",
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "-ar", "16000",  # 16kHz for Whisper
+            "-ac", "1",  # Mono
+            "pipe:1"
+        ]
+        
+        try:
+            stdout, _ = await cls._run(cmd, timeout=timeout)
+        except subprocess.CalledProcessError as error:
+            if cls._parse_ffmpeg_log(error.stderr.decode("utf-8", errors="replace"))["audio_codec"] is not None:
+                raise
+            # Silent recording: the optional map left the output empty
+            stdout = b""
+        return cls._pcm_to_float32(stdout)
+    
+    @staticmethod
+    def _pcm_to_float32(data: bytes):
+        """Convert s16le PCM bytes to the float32 format Whisper expects."""
+        import numpy as np
+        return np.frombuffer(data, np.int16).flatten().astype(np.float32) / 32768.0
+    
+    @classmethod
+    async def process_media(
+        cls,
+        video_path: str,
+        thumbnail_path: Optional[str] = None,
+        timestamp: float = 1.0,
+        width: int = 480,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        Produce thumbnail, Whisper audio and metadata in one ffmpeg run.
+        
+        The container is demuxed and decoded once; the video stream feeds
+        the thumbnail output and the audio stream is piped back as raw
+        16 kHz mono PCM. Duration and codec info are parsed from ffmpeg's
+        own log output, so no separate ffprobe call is needed.
+        
+        Args:
+            video_path: Path to video file
+            thumbnail_path: Path for thumbnail image (optional)
+            timestamp: Time in seconds to extract the thumbnail frame
+            width: Thumbnail width (height auto-scaled)
+            timeout: Command timeout in seconds (optional)
+            
+        Returns:
+            Dictionary with thumbnail_path (None if there is no video
+            stream or it is shorter than ``timestamp``), audio (float32
+            samples for Whisper, empty without an audio track), duration
+            and codec metadata
+        """
+        if not thumbnail_path:
+            fd, thumbnail_path = tempfile.mkstemp(suffix=".jpg")
+            os.close(fd)
+        
+        try:
+            stdout, stderr = await cls._run(cls._media_cmd(video_path, thumbnail_path, timestamp, width), timeout=timeout)
+        except subprocess.CalledProcessError as error:
+            # ffmpeg refuses an output whose optional map matched nothing
+            # (no audio track, or an audio-only file): run again with only
+            # the output the file has a stream for
+            streams = cls._parse_ffmpeg_log(error.stderr.decode("utf-8", errors="replace"))
+            has_video = streams["video_codec"] is not None
+            has_audio = streams["audio_codec"] is not None
+            if has_video == has_audio:
+                raise
+            cmd = cls._media_cmd(video_path, thumbnail_path, timestamp, width, video=has_video, audio=has_audio)
+            stdout, stderr = await cls._run(cmd, timeout=timeout)
+        metadata = cls._parse_ffmpeg_log(stderr.decode("utf-8", errors="replace"))
+        
+        if metadata["video_codec"] is None or os.path.getsize(thumbnail_path) == 0:
+            # No video stream, or the video is shorter than the thumbnail timestamp
+            os.remove(thumbnail_path)
+            thumbnail_path = None
+        
+        return {
+            "thumbnail_path": thumbnail_path,
+            "audio": cls._pcm_to_float32(stdout),
+            **metadata
+        }
+    
+    @staticmethod
+    def _media_cmd(
+        video_path: str,
+        thumbnail_path: str,
+        timestamp: float,
+        width: int,
+        video: bool = True,
+        audio: bool = True
+    ) -> List[str]:
+        """ffmpeg command for process_media with the requested outputs."""
+        cmd = ["ffmpeg", "-hide_banner", "-nostdin", "-i", video_path]
+        if video:
+            # Output 1: thumbnail
+            cmd += [
+                "-map", "0:v:0?",
+                "-vf", f"trim=start={timestamp},scale={width}:-1",
+                "-frames:v", "1",
+                "-y", thumbnail_path
+            ]
+        if audio:
+            # Output 2: raw audio for Whisper on stdout
+            cmd += [
+                "-map", "0:a:0?",
+                "-f", "s16le",
+                "-acodec", "pcm_s16le",
+                "-ar", "16000",  # 16kHz for Whisper
+                "-ac", "1",  # Mono
+                "pipe:1"
+            ]
+        return cmd
+    
     @staticmethod
+    def _parse_ffmpeg_log(log: str) -> Dict:
+        """Extract duration and stream info from ffmpeg stderr output."""
+        metadata = {
+            "duration": 0.0,
+            "video_codec": None,
+            "audio_codec": None,
+            "width": None,
+            "height": None
+        }
+        
+        def to_seconds(h, m, s):
+            return int(h) * 3600 + int(m) * 60 + float(s)
+        
+        match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", log)
+        if match:
+            metadata["duration"] = to_seconds(*match.groups())
+        else:
+            # Containers like MediaRecorder webm have no duration header,
+            # use the last progress timestamp of the decode instead
+            times = re.findall(r"time=(\d+):(\d+):(\d+(?:\.\d+)?)", log)
+            if times:
+                metadata["duration"] = to_seconds(*times[-1])
+        
+        # Only the input section describes the source streams
+        input_log = log.split("Output #0", 1)[0]
+        video = re.search(r"Stream #0:\d+.*?: Video: (\w+).*?(\d{2,5})x(\d{2,5})", input_log)
+        if video:
+            metadata["video_codec"] = video.group(1)
+            metadata["width"] = int(video.group(2))
+            metadata["height"] = int(video.group(3))
+        audio = re.search(r"Stream #0:\d+.*?: Audio: (\w+)", input_log)
+        if audio:
+            metadata["audio_codec"] = audio.group(1)
+        
+        return metadata
+    
+    @classmethod
     async def create_preview_clip(
+        cls,
         video_path: str,
         output_path: Optional[str] = None,
         start: float = 0,
-        duration: float = 5
+        duration: float = 5,
+        timeout: Optional[float] = None
     ) -> str:
         """
         Create a short preview clip from video.
@@ -158,6 +407,7 @@ class VideoProcessor:
             output_path: Path for output clip (optional)
             start: Start time in seconds
             duration: Clip duration in seconds
+            timeout: Command timeout in seconds (optional)
             
         Returns:
             Path to preview clip
@@ -179,5 +429,5 @@ class VideoProcessor:
             output_path
         ]
         
-        subprocess.run(cmd, check=True, capture_output=True)
+        await cls._run(cmd, timeout=timeout)
         return output_path
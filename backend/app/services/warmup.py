@@ -0,0 +1,70 @@
+import asyncio
+import time
+from typing import Optional
+
+from app.config import settings
+from app.services.stt import get_stt
+from app.services.ai import AIService
+
+# Set once every configured model is loaded and warmed up
+_models_ready = False
+
+
+def models_ready() -> bool:
+    """Whether preloading has finished."""
+    return _models_ready
+
+
+def mark_models_ready():
+    """Mark models as ready (used when this process does not preload)."""
+    global _models_ready
+    _models_ready = True
+
+
+async def preload_models(stt_backend: Optional[str] = None):
+    """
+    Load and warm up the models used by the processing pipeline.
+    
+    Only the configured STT backend and, if SUMMARIZER_MODEL is set, the
+    summarizer are loaded. Loading runs in a thread so the event loop
+    keeps serving requests (e.g. health checks) meanwhile.
+    
+    Args:
+        stt_backend: STT backend to warm up (defaults to STT_BACKEND)
+    """
+    start = time.monotonic()
+    await asyncio.to_thread(get_stt(stt_backend).warmup)
+    await asyncio.to_thread(AIService().warmup)
+    mark_models_ready()
+    print(f"🧠 Models loaded in {time.monotonic() - start:.1f}s")
+
+
+def start_preload(stt_backend: Optional[str] = None) -> asyncio.Task:
+    """
+    Preload models in a background task, retrying until it succeeds.
+    
+    A failed attempt is logged and retried after PRELOAD_RETRY_SECONDS,
+    doubling up to PRELOAD_RETRY_MAX_SECONDS, so a transient error (a
+    model download, a model server that isn't up yet) doesn't leave
+    /ready at 503 for the life of the process.
+    
+    Args:
+        stt_backend: STT backend to warm up (defaults to STT_BACKEND)
+        
+    Returns:
+        The task, to be cancelled on shutdown
+    """
+    async def run():
+        delay = settings.PRELOAD_RETRY_SECONDS
+        attempt = 1
+        while True:
+            try:
+                await preload_models(stt_backend)
+                return
+            except Exception as e:
+                print(f"⚠️ Model preload attempt {attempt} failed: {e}; retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.PRELOAD_RETRY_MAX_SECONDS)
+            attempt += 1
+    
+    return asyncio.create_task(run())
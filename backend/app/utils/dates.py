@@ -0,0 +1,15 @@
+"""Datetime helpers for the naive-UTC timestamp columns."""
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert an aware datetime to naive UTC; naive values are taken as UTC.
+
+    Timestamp columns are ``TIMESTAMP WITHOUT TIME ZONE`` holding UTC, and
+    asyncpg refuses to bind aware datetimes to them.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
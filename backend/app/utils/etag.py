@@ -0,0 +1,106 @@
+"""
+Conditional GET support.
+
+Responses get a strong ETag and a Cache-Control policy. When the request's
+If-None-Match matches, the dependency answers 304 before the endpoint runs,
+so the rows are neither queried nor serialized.
+"""
+import hashlib
+from datetime import datetime
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models.entry import Entry
+from app.models.user import User
+from app.services.cache import get_entries_version
+from app.utils.security import get_current_active_user
+
+# Per-user data: only the client may keep it, and must revalidate each use
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+
+
+def cache_control_max_age(seconds: int) -> str:
+    """Per-user data the client may reuse for ``seconds`` without asking."""
+    return f"private, max-age={seconds}"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the values a response depends on."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match covers ``etag`` (weak comparison, as for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip() for value in header.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def conditional_response(request: Request, response: Response, etag: str, cache_control: str):
+    """Answer 304 if the client's copy is current, else add the caching headers."""
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+class UserDataETag:
+    """
+    Dependency for endpoints whose response only depends on the user's
+    entries and the query string.
+
+    The ETag is built from the user's ``entries_version``, a single
+    primary key lookup.
+    """
+
+    def __init__(self, scope: str, cache_control: str = CACHE_CONTROL_REVALIDATE, daily: bool = False):
+        """
+        Args:
+            scope: Endpoint name, part of the ETag
+            cache_control: Cache-Control header for the endpoint
+            daily: Also change the ETag every day, for windows relative to today
+        """
+        self.scope = scope
+        self.cache_control = cache_control
+        self.daily = daily
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_active_user),
+        db: AsyncSession = Depends(get_db)
+    ):
+        parts = [
+            current_user.id,
+            await get_entries_version(db, current_user.id),
+            self.scope,
+            sorted(request.query_params.multi_items()),
+        ]
+        if self.daily:
+            parts.append(datetime.utcnow().date().isoformat())
+        conditional_response(request, response, make_etag(*parts), self.cache_control)
+
+
+async def entry_etag(
+    entry_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Dependency for a single entry: the ETag comes from its updated_at."""
+    updated_at = await db.scalar(select(Entry.updated_at).where(
+        Entry.id == entry_id,
+        Entry.user_id == current_user.id
+    ))
+    if updated_at is None:
+        # Missing entry: the endpoint answers 404
+        return
+    conditional_response(request, response, make_etag(entry_id, updated_at.isoformat()), CACHE_CONTROL_REVALIDATE)
@@ -1,15 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.services.cache import UserCache
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -25,10 +29,63 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
+class PasswordHashingPool:
+    """
+    Runs bcrypt off the event loop in a small dedicated thread pool.
+    
+    A bcrypt call takes a few hundred ms of CPU; running it inline in an
+    async handler stalls every other request on the worker. Calls queue
+    for a free thread, and once PASSWORD_HASH_MAX_PENDING calls are
+    queued or running, new ones are rejected with 503 instead of piling
+    up behind a login burst.
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        """Singleton pattern."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._executor = None
+            cls._instance.pending = 0
+        return cls._instance
+    
+    async def run(self, func, *args):
+        """Run a hashing function in the pool."""
+        if self.pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin",
+                headers={"Retry-After": "1"}
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="bcrypt"
+            )
+        
+        # Only touched from the event loop thread, no lock needed
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password in the hashing pool."""
+    return await PasswordHashingPool().run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash in the hashing pool."""
+    return await PasswordHashingPool().run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -50,7 +107,7 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         if user_id is None:
             return None
         # Ensure user_id is an integer
-        return TokenData(user_id=int(user_id), email=email)
+        return TokenData(user_id=int(user_id), email=email, expires_at=payload.get("exp"))
     except JWTError as e:
         print(f"JWT decode error: {e}")
         return None
@@ -61,22 +118,41 @@ def decode_access_token(token: str) -> Optional[TokenData]:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
-    """Get current authenticated user from token."""
+    """
+    Get current authenticated user from token.
+    
+    Decoded tokens and user snapshots are cached (see UserCache). On a
+    hit the snapshot is attached to the session without a query; columns
+    outside the snapshot, like the password hash, are not loaded and
+    must be fetched with ``await db.refresh(user, [...])`` before use.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Geçersiz kimlik bilgileri",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cache = UserCache()
     
-    token_data = decode_access_token(token)
-    if token_data is None:
-        raise credentials_exception
+    user_id = cache.get_token(token)
+    if user_id is None:
+        token_data = decode_access_token(token)
+        if token_data is None:
+            raise credentials_exception
+        user_id = token_data.user_id
+        cache.set_token(token, user_id, token_data.expires_at)
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
-    if user is None:
-        raise credentials_exception
+    snapshot = await cache.get_user(user_id)
+    if snapshot is not None:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        user = await db.merge(user, load=False)
+    else:
+        user = await db.get(User, user_id)
+        if user is None:
+            raise credentials_exception
+        await cache.set_user(user)
     
     if not user.is_active:
         raise HTTPException(
@@ -90,12 +166,7 @@ async def get_current_user(
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
-    """Get current active user."""
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Hesap aktif değil"
-        )
+    """Get current active user (is_active is checked by get_current_user)."""
     return current_user
 
 
@@ -0,0 +1,139 @@
+"""Turkish-aware text normalization, tokenization and stemming."""
+import re
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple
+
+VOWELS = set("aeıioöuü")
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Inflectional suffixes stripped by the stemmer, with the kind of stem
+# they attach to: buffer consonant forms (y/n/s) follow a vowel, bare
+# vowel forms follow a consonant. This keeps e.g. "eşya" from stemming
+# to "eş". Derivational suffixes (-lı, -sız, ...) are left alone since
+# they change meaning ("mutlu" vs "mutsuz").
+_SUFFIXES = {
+    "vowel": [
+        # Buffer consonant forms: case, possessive, copula
+        "yım", "yim", "yum", "yüm", "yız", "yiz", "yuz", "yüz",
+        "nın", "nin", "nun", "nün", "nda", "nde", "ndan", "nden",
+        "yla", "yle", "ya", "ye", "yı", "yi", "yu", "yü",
+        "nı", "ni", "nu", "nü", "sı", "si", "su", "sü",
+        "mız", "miz", "muz", "müz", "m",
+    ],
+    "consonant": [
+        # Bare vowel forms: case, possessive, copula
+        "ımız", "imiz", "umuz", "ümüz", "ım", "im", "um", "üm",
+        "ın", "in", "un", "ün", "ı", "i", "u", "ü", "a", "e",
+        "la", "le",
+    ],
+    "any": [
+        # Plural, locative/ablative
+        "ları", "leri", "lar", "ler",
+        "dan", "den", "tan", "ten", "da", "de", "ta", "te",
+    ],
+    "verb": [
+        # Past tense, infinitive; need a longer stem ("yemek" stays intact)
+        "dım", "dim", "dum", "düm", "tım", "tim", "tum", "tüm",
+        "dık", "dik", "duk", "dük", "tık", "tik", "tuk", "tük",
+        "dı", "di", "du", "dü", "tı", "ti", "tu", "tü",
+        "mak", "mek", "ma", "me",
+    ],
+}
+
+# Final consonants softened before a vowel suffix (yemeği -> yemek)
+SOFTENED = {"ğ": "k", "b": "p", "c": "ç"}
+
+# (suffix, requirement) pairs, longest first
+SUFFIXES = sorted(
+    ((suffix, kind) for kind, suffixes in _SUFFIXES.items() for suffix in suffixes),
+    key=lambda item: len(item[0]),
+    reverse=True
+)
+
+MIN_STEM_LENGTH = 2
+MIN_VERB_STEM_LENGTH = 3
+MAX_STRIP_PASSES = 3
+
+
+def turkish_lower(text: str) -> str:
+    """Lowercase with Turkish dotted/dotless I rules (İ→i, I→ı)."""
+    return text.replace("İ", "i").replace("I", "ı").lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into Turkish-lowercased word tokens."""
+    return TOKEN_RE.findall(turkish_lower(text))
+
+
+def _strip_suffixes(token: str) -> List[Tuple[str, str]]:
+    """Every allowed single suffix strip, longest suffix first, as (base, kind)."""
+    stripped = []
+    for suffix, kind in SUFFIXES:
+        if not token.endswith(suffix):
+            continue
+        base = token[:-len(suffix)]
+        min_length = MIN_VERB_STEM_LENGTH if kind == "verb" else MIN_STEM_LENGTH
+        if len(base) < min_length:
+            continue
+        if kind == "vowel" and base[-1] not in VOWELS:
+            continue
+        if kind == "consonant":
+            if base[-1] in VOWELS:
+                continue
+            base = base[:-1] + SOFTENED.get(base[-1], base[-1])
+        stripped.append((base, kind))
+    return stripped
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """
+    Strip inflectional suffixes from a lowercased token.
+
+    A light suffix stripper, not a full morphological analyzer: it only
+    needs to map inflected forms of a word to the same key.
+    """
+    for _ in range(MAX_STRIP_PASSES):
+        stripped = _strip_suffixes(token)
+        if not stripped:
+            break
+        token = stripped[0][0]
+    return token
+
+
+@lru_cache(maxsize=65536)
+def stem_forms(token: str) -> FrozenSet[str]:
+    """
+    The token and every form suffix stripping can reduce it to.
+
+    Unlike ``stem``, which always takes the longest suffix, this follows
+    every reading: "oyunda" is "oyun" + "da" as well as "oyu" + "nda".
+    A vocabulary lookup accepts any of them, so "oyunda" matches "oyun"
+    while "oy" (vote) and "oylar" never produce it.
+    """
+    forms = {token}
+    frontier = {token}
+    for _ in range(MAX_STRIP_PASSES):
+        frontier = {base for form in frontier for base, _ in _strip_suffixes(form)} - forms
+        if not frontier:
+            break
+        forms |= frontier
+    return frozenset(forms)
+
+
+def vocabulary_form(word: str) -> str:
+    """
+    Form a vocabulary word is looked up by among a token's stem_forms.
+
+    Vocabulary words are dictionary forms and are kept as written
+    ("dizi" must not become "diz", knee). Only a consonant-final
+    conjugated verb ("kazandım") drops its tense/person ending, so
+    "kazandık" matches too; vowel-final words ("parti") are never cut.
+    """
+    if word[-1] in VOWELS:
+        return word
+    stripped = _strip_suffixes(word)
+    if stripped and stripped[0][1] == "verb":
+        return stripped[0][0]
+    return word
@@ -0,0 +1,301 @@
+"""
+Video processing worker.
+
+Runs the CPU-heavy part of the pipeline (ffmpeg, Whisper, AI analysis)
+outside the API process, so both tiers can be scaled independently:
+
+    python -m app.worker
+"""
+import asyncio
+import os
+import signal
+import socket
+import traceback
+import uuid
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.entry import Entry
+from app.models.job import ProcessingJob
+from app.models.transcript import TranscriptSegment
+from app.services.queue import JobQueue, JobLostError
+from app.services.storage import StorageService
+from app.services.video import VideoProcessor
+from app.services.stt import get_stt
+from app.services.ai import AIService
+from app.services.warmup import preload_models
+from app.services.mood_stats import refresh_daily_mood_stats
+from app.services.cache import bump_entries_version
+
+
+# Whisper audio sample rate
+SAMPLE_RATE = 16000
+
+
+class JobContext:
+    """Per-claim scratch state shared between the stages of one job."""
+
+    def __init__(self, entry: Entry, db, heartbeat):
+        self.entry = entry
+        self.db = db
+        self.heartbeat = heartbeat
+        self.video_path = None
+        self.audio = None
+        self.temp_files = []
+
+    async def get_video_path(self) -> str:
+        """Download the entry's video once per claim."""
+        if self.video_path is None:
+            self.video_path = await StorageService().download_to_temp(self.entry.video_key)
+            self.temp_files.append(self.video_path)
+        return self.video_path
+
+    def cleanup(self):
+        """Remove temp files created while processing."""
+        for path in self.temp_files:
+            if path and os.path.exists(path):
+                os.remove(path)
+
+
+async def stage_media(ctx: JobContext):
+    """Thumbnail, duration and Whisper audio from a single ffmpeg pass."""
+    entry = ctx.entry
+    storage = StorageService()
+    video_path = await ctx.get_video_path()
+
+    media = await VideoProcessor.process_media(video_path)
+    ctx.audio = media["audio"]
+
+    thumbnail_path = media["thumbnail_path"]
+    if thumbnail_path is None and media["video_codec"] is not None:
+        # Very short clip, fall back to the first frame
+        thumbnail_path = await VideoProcessor.generate_thumbnail(video_path, timestamp=0)
+
+    if thumbnail_path is not None:
+        ctx.temp_files.append(thumbnail_path)
+        thumbnail_key = f"thumbnails/{entry.user_id}/{uuid.uuid4()}.jpg"
+        with open(thumbnail_path, "rb") as f:
+            entry.thumbnail_url = await storage.upload_file(thumbnail_key, f.read(), "image/jpeg")
+
+    entry.duration_seconds = media["duration"]
+    refresh_daily_mood_stats(ctx.db, entry.user_id, [entry.recorded_at.date()])
+
+
+def _segment_field(segment, name: str, default=None):
+    """Read a segment field from a dict or an API response object."""
+    if isinstance(segment, dict):
+        return segment.get(name, default)
+    return getattr(segment, name, default)
+
+
+async def stage_transcribe(ctx: JobContext):
+    """
+    Transcribe the audio in chunks, persisting segments after each one.
+
+    If the worker dies, the next claim resumes after the last chunk that
+    was committed instead of starting over.
+    """
+    entry = ctx.entry
+    db = ctx.db
+
+    if ctx.audio is None:
+        # Media stage ran in an earlier claim, decode the audio again
+        video_path = await ctx.get_video_path()
+        ctx.audio = await VideoProcessor.extract_audio_pcm(video_path)
+
+    if len(ctx.audio) == 0:
+        # No audio track, nothing to transcribe
+        return
+
+    stt = get_stt()
+    chunk_size = settings.STT_CHUNK_SECONDS * SAMPLE_RATE
+    resume_from = db.query(func.max(TranscriptSegment.chunk_end_seconds)).filter(
+        TranscriptSegment.entry_id == entry.id
+    ).scalar() or 0
+    start = int(resume_from * SAMPLE_RATE)
+
+    for offset in range(start, len(ctx.audio), chunk_size):
+        chunk_start = offset / SAMPLE_RATE
+        chunk_end = min(offset + chunk_size, len(ctx.audio)) / SAMPLE_RATE
+
+        result = await stt.transcribe(ctx.audio[offset:offset + chunk_size])
+        if result.get("error"):
+            raise RuntimeError(f"Transcription failed: {result['error']}")
+
+        rows = []
+        for segment in result.get("segments", []):
+            text = (_segment_field(segment, "text") or "").strip()
+            if not text:
+                continue
+            rows.append({
+                "entry_id": entry.id,
+                "start_seconds": chunk_start + float(_segment_field(segment, "start", 0)),
+                "end_seconds": min(chunk_start + float(_segment_field(segment, "end", 0)), chunk_end),
+                "text": text,
+                "chunk_end_seconds": chunk_end
+            })
+        if rows:
+            # Whisper can emit several segments with the same start (e.g.
+            # zero-length ones); keep the first
+            db.execute(
+                insert(TranscriptSegment)
+                .values(rows)
+                .on_conflict_do_nothing(constraint="uq_transcript_segments_entry_start")
+            )
+
+        # Commit the chunk and extend the job's visibility timeout
+        ctx.heartbeat()
+
+    texts = db.query(TranscriptSegment.text).filter(
+        TranscriptSegment.entry_id == entry.id
+    ).order_by(TranscriptSegment.start_seconds).all()
+    entry.transcript = " ".join(text for (text,) in texts)
+
+
+async def stage_analyze(ctx: JobContext):
+    """Summary, tags and sentiment from the transcript."""
+    entry = ctx.entry
+    if entry.transcript:
+        analysis = await AIService().analyze_text(entry.transcript)
+        entry.summary = analysis["summary"]
+        entry.auto_tags = analysis["tags"]
+        entry.sentiment_score = analysis["sentiment"]
+
+
+STAGE_HANDLERS = {
+    "media": stage_media,
+    "transcribe": stage_transcribe,
+    "analyze": stage_analyze,
+}
+
+
+async def keep_alive(job_id: int, worker_id: str):
+    """
+    Extend a job's visibility timeout while one of its stages runs.
+
+    Uses its own session so it never commits the stage's half-done work,
+    in a thread so a slow database doesn't stall the other slots' stages
+    and heartbeats. Only returns by raising JobLostError.
+    """
+    def heartbeat():
+        db = SessionLocal()
+        try:
+            JobQueue(db).heartbeat(job_id, worker_id)
+        finally:
+            db.close()
+
+    while True:
+        # Three heartbeats per timeout, so one slow one doesn't lose the job
+        await asyncio.sleep(settings.JOB_VISIBILITY_TIMEOUT_SECONDS / 3)
+        await asyncio.to_thread(heartbeat)
+
+
+async def run_stage(handler, ctx: JobContext, job_id: int, worker_id: str):
+    """Run a stage handler, cancelling it if the job is lost meanwhile."""
+    stage = asyncio.create_task(handler(ctx))
+    heartbeat = asyncio.create_task(keep_alive(job_id, worker_id))
+    try:
+        await asyncio.wait({stage, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+        if not stage.done():
+            heartbeat.result()
+        return stage.result()
+    finally:
+        stage.cancel()
+        heartbeat.cancel()
+        # Let a cancelled stage kill its ffmpeg before temp files go away
+        await asyncio.gather(stage, heartbeat, return_exceptions=True)
+
+
+async def run_job(queue: JobQueue, job: ProcessingJob, worker_id: str):
+    """
+    Run the remaining stages of a claimed job, committing after each.
+
+    Queue calls run in a thread, like the heartbeats (see keep_alive);
+    the session is never used by two of them at once.
+    """
+    db = queue.db
+    job_id = job.id
+    entry = await asyncio.to_thread(lambda: db.query(Entry).filter(Entry.id == job.entry_id).first())
+    if not entry:
+        await asyncio.to_thread(queue.fail, job, worker_id, "Entry no longer exists")
+        return
+
+    ctx = JobContext(entry, db, lambda: queue.heartbeat(job_id, worker_id))
+    try:
+        while True:
+            stage = job.stage
+            try:
+                await run_stage(STAGE_HANDLERS[stage], ctx, job_id, worker_id)
+            except JobLostError:
+                raise
+            except Exception as e:
+                db.rollback()
+                print(f"Error processing entry {entry.id} at stage {stage}: {e}")
+                traceback.print_exc()
+                if not await asyncio.to_thread(queue.fail, job, worker_id, f"{type(e).__name__}: {e}"):
+                    # Mark as processed even on error so clients stop waiting
+                    entry.is_processed = True
+                    bump_entries_version(db, entry.user_id)
+                    await asyncio.to_thread(db.commit)
+                return
+
+            # The stage's results are committed together with the job's
+            # progress, so a worker that lost the job can't write them
+            entry.updated_at = datetime.utcnow()
+            if stage == JobQueue.STAGES[-1]:
+                entry.is_processed = True
+            bump_entries_version(db, entry.user_id)
+            if not await asyncio.to_thread(queue.advance, job, worker_id):
+                return
+    except JobLostError as e:
+        print(f"Worker {worker_id} dropped job {job_id}: {e}")
+    finally:
+        ctx.cleanup()
+
+
+async def worker_slot(worker_id: str, stop: asyncio.Event):
+    """Claim and run jobs until asked to stop."""
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            queue = JobQueue(db)
+            job = await asyncio.to_thread(queue.claim, worker_id)
+            if job:
+                await run_job(queue, job, worker_id)
+                continue
+        except Exception as e:
+            print(f"Worker {worker_id} error: {e}")
+        finally:
+            db.close()
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.WORKER_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def main():
+    """Worker entry point."""
+    # Load models before claiming jobs so the first job doesn't pay for it
+    await preload_models()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    host = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"🛠️  Worker {host} started with {settings.WORKER_CONCURRENCY} slots")
+    await asyncio.gather(*[
+        worker_slot(f"{host}/{slot}", stop)
+        for slot in range(settings.WORKER_CONCURRENCY)
+    ])
+    print(f"👋 Worker {host} shutting down")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
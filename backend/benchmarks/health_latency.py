@@ -0,0 +1,151 @@
+"""
+Latency of /health while video jobs run in the same process.
+
+Serves the API with uvicorn and, in its event loop, keeps --jobs
+``VideoProcessor`` jobs (thumbnail + H.264 compression of a generated
+clip) running for --seconds. A separate thread polls /health and reports
+p50/p99/max latency for an idle baseline and under load.
+
+- ``async``: ``VideoProcessor`` as shipped (asyncio subprocesses)
+- ``blocking``: the same commands through ``subprocess.run`` (the old path)
+
+Needs ffmpeg on PATH.
+
+    python -m benchmarks.health_latency --jobs 4 --mode async
+    python -m benchmarks.health_latency --jobs 4 --mode blocking
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _make_clip(path: str, seconds: int):
+    """Test pattern video with a sine tone."""
+    subprocess.run(
+        [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"testsrc=size=1280x720:rate=30:duration={seconds}",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+            "-c:v", "libvpx", "-b:v", "2M", "-c:a", "libopus",
+            "-y", path
+        ],
+        check=True
+    )
+
+
+def _use_blocking_subprocess(video_processor):
+    """Swap VideoProcessor._run for a subprocess.run version."""
+    async def _run(cls, cmd, timeout=None, check=True):
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout, check=check)
+        return result.stdout, result.stderr
+
+    video_processor._run = classmethod(_run)
+
+
+def _poll(url: str, stop: threading.Event, interval: float) -> list:
+    """GET url until stopped; returns latencies in ms."""
+    import httpx
+
+    latencies = []
+    with httpx.Client(timeout=60) as client:
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get(url).raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(interval)
+    return latencies
+
+
+async def _measure(name: str, url: str, seconds: float, interval: float, load=None):
+    stop = threading.Event()
+    result = {}
+    poller = threading.Thread(target=lambda: result.update(latencies=_poll(url, stop, interval)))
+    poller.start()
+    try:
+        if load is None:
+            await asyncio.sleep(seconds)
+        else:
+            await load(seconds)
+    finally:
+        stop.set()
+        await asyncio.to_thread(poller.join)
+
+    latencies = sorted(result["latencies"])
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:>8}: {len(latencies):5d} requests, p50 {statistics.median(latencies):8.1f} ms, "
+        f"p99 {p99:8.1f} ms, max {latencies[-1]:8.1f} ms"
+    )
+
+
+async def run(args, clip: str):
+    import uvicorn
+    from app.main import app
+    from app.services.video import VideoProcessor
+
+    if args.mode == "blocking":
+        _use_blocking_subprocess(VideoProcessor)
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    async def video_job(deadline: float, workdir: str, index: int):
+        thumbnail = os.path.join(workdir, f"{index}.jpg")
+        compressed = os.path.join(workdir, f"{index}.mp4")
+        while time.monotonic() < deadline:
+            await VideoProcessor.generate_thumbnail(clip, thumbnail)
+            await VideoProcessor.compress_video(clip, compressed, quality="low")
+
+    async def load(seconds: float):
+        deadline = time.monotonic() + seconds
+        with tempfile.TemporaryDirectory() as workdir:
+            await asyncio.gather(*(video_job(deadline, workdir, i) for i in range(args.jobs)))
+
+    url = f"http://127.0.0.1:{port}/health"
+    try:
+        await _measure("idle", url, args.seconds, args.interval)
+        await _measure(f"{args.jobs} jobs", url, args.seconds, args.interval, load)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.health_latency")
+    parser.add_argument("--jobs", type=int, default=4, help="concurrent video jobs")
+    parser.add_argument("--mode", choices=["async", "blocking"], default="async")
+    parser.add_argument("--seconds", type=float, default=20, help="duration of each phase")
+    parser.add_argument("--interval", type=float, default=0.01, help="pause between /health requests")
+    parser.add_argument("--clip-seconds", type=int, default=10)
+    args = parser.parse_args()
+
+    # Settings are read on import
+    os.environ["PRELOAD_MODELS"] = "false"
+    os.environ["FFMPEG_CONCURRENCY"] = str(args.jobs)
+
+    fd, clip = tempfile.mkstemp(suffix=".webm")
+    os.close(fd)
+    try:
+        _make_clip(clip, args.clip_seconds)
+        asyncio.run(run(args, clip))
+    finally:
+        os.remove(clip)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Keyword matching time per transcript, token index vs substring loops.
+
+Builds Turkish transcripts of increasing length (--words words each) from
+sentences mixing vocabulary words, inflected forms and filler, then times
+for each length:
+
+- ``loops``: the old ``auto_tag``, ``analyze_sentiment`` and
+  ``_extractive_summary``, each lowercasing the text and testing every
+  keyword with ``keyword in text`` (per sentence for the summary)
+- ``index``: ``AIService.analyze_text``, one tokenizer pass matched
+  against ``KeywordIndex`` for all three
+- ``index x3``: ``auto_tag``, ``analyze_sentiment`` and
+  ``_extractive_summary`` called separately, one scan each
+
+No database or models are needed.
+
+    python -m benchmarks.keyword_match --words 100 1000 10000 50000
+"""
+import argparse
+import asyncio
+import random
+import re
+import statistics
+import time
+
+SENTENCES = [
+    "Bugün ofiste uzun bir toplantı vardı ve proje hakkında konuştuk",
+    "Akşam annemle babamı aradım, kardeşim de oradaydı",
+    "Arkadaşlarla buluşmaya gittik ama çok yorgundum",
+    "Sabah koşuya çıktım, sonra doktora uğradım",
+    "Yeni bir diziye başladım, müziği harika",
+    "Kahvaltıda kahve içtim ve kitap okudum",
+    "Tatil için otel araştırması yaptım, uçuşlar pahalı",
+    "İşler yüzünden stresliydim ve biraz endişeliydim",
+    "Sonunda kursu tamamladım, çok mutluyum",
+    "Hava güzeldi, parkta yürüdük ve keyifli bir gün geçirdik",
+    "Trafik berbattı, eve geç kaldım",
+    "Bu kişi sokakta eşya satıyordu",
+    "Öğleden sonra biraz dinlendim",
+    "Pencereden dışarıyı izledim",
+    "Yarın için plan yapmadım henüz",
+]
+
+
+def make_transcript(words: int, rng: random.Random) -> str:
+    """A transcript of about ``words`` words."""
+    sentences = []
+    count = 0
+    while count < words:
+        sentence = rng.choice(SENTENCES)
+        sentences.append(sentence)
+        count += len(sentence.split())
+    return ". ".join(sentences) + "."
+
+
+class SubstringLoops:
+    """The matching as it was before KeywordIndex: nested substring tests."""
+
+    def __init__(self, service):
+        self.keywords = service.KEYWORDS
+        self.positive_words = service.POSITIVE_WORDS
+        self.negative_words = service.NEGATIVE_WORDS
+
+    def extractive_summary(self, text: str, max_sentences: int = 2) -> str:
+        sentences = re.split(r'[.!?]+', text)
+        sentences = [s.strip() for s in sentences if s.strip()]
+
+        if len(sentences) <= max_sentences:
+            return text
+
+        scored = []
+        for i, sentence in enumerate(sentences):
+            score = 0
+            words = sentence.lower().split()
+            if i == 0:
+                score += 2
+            for category, keywords in self.keywords.items():
+                for keyword in keywords:
+                    if keyword in sentence.lower():
+                        score += 1
+            if len(words) < 5:
+                score -= 1
+            scored.append((score, i, sentence))
+
+        scored.sort(reverse=True)
+        top_indices = sorted([s[1] for s in scored[:max_sentences]])
+        return ". ".join([sentences[i] for i in top_indices]) + "."
+
+    def auto_tag(self, text: str) -> list:
+        text_lower = text.lower()
+        found_tags = []
+        for tag, keywords in self.keywords.items():
+            for keyword in keywords:
+                if keyword in text_lower:
+                    if tag not in found_tags:
+                        found_tags.append(tag)
+                    break
+        return found_tags[:5]
+
+    def analyze_sentiment(self, text: str) -> float:
+        text_lower = text.lower()
+        positive_count = sum(1 for word in self.positive_words if word in text_lower)
+        negative_count = sum(1 for word in self.negative_words if word in text_lower)
+        total = positive_count + negative_count
+        if total == 0:
+            return 0.0
+        return max(-1.0, min(1.0, (positive_count - negative_count) / max(total, 1)))
+
+
+def timed(fn, texts: list, repeat: int) -> list:
+    """Milliseconds per call of ``fn`` on each text, best of ``repeat`` runs."""
+    results = []
+    for text in texts:
+        runs = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(text)
+            runs.append((time.perf_counter() - started) * 1000)
+        results.append(min(runs))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.keyword_match")
+    parser.add_argument("--words", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--transcripts", type=int, default=5, help="transcripts per length")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per transcript, the best one counts")
+    args = parser.parse_args()
+
+    from app.services.ai import AIService
+
+    service = AIService()
+    loops = SubstringLoops(service)
+    rng = random.Random(42)
+    loop = asyncio.new_event_loop()
+
+    def run_loops(text):
+        loops.auto_tag(text)
+        loops.analyze_sentiment(text)
+        loops.extractive_summary(text)
+
+    def run_index(text):
+        loop.run_until_complete(service.analyze_text(text))
+
+    def run_index_separately(text):
+        loop.run_until_complete(service.auto_tag(text))
+        loop.run_until_complete(service.analyze_sentiment(text))
+        service._extractive_summary(text)
+
+    modes = {"loops": run_loops, "index": run_index, "index x3": run_index_separately}
+
+    # Fill the stemmer cache the way a running worker would have
+    run_index(make_transcript(1000, rng))
+
+    for words in args.words:
+        texts = [make_transcript(words, rng) for _ in range(args.transcripts)]
+        medians = {}
+        for mode, fn in modes.items():
+            medians[mode] = statistics.median(timed(fn, texts, args.repeat))
+        print(
+            f"{words:6d} words: "
+            + ", ".join(f"{mode} {ms:8.2f} ms" for mode, ms in medians.items())
+            + f", loops/index {medians['loops'] / medians['index']:5.1f}x"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Real-time factor and memory of the STT backends across model sizes.
+
+Each backend/model pair runs in a fresh subprocess, which loads the
+model, warms it up and transcribes --audio --runs times. Reported per
+pair:
+
+- load: seconds to load and warm up the model
+- RTF: transcription wall time / audio duration (lower is better, < 1
+  is faster than real time), best of --runs
+- RSS: peak resident memory of the process
+
+    pip install openai-whisper faster-whisper
+    python -m benchmarks.stt_backends --audio sample.wav
+    python -m benchmarks.stt_backends --audio sample.wav --backends faster-whisper --models tiny base small
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+
+def child(backend: str, model: str, audio_path: str, runs: int):
+    """Measure one backend/model pair, print the result as JSON."""
+    # Settings are read on import
+    os.environ["WHISPER_MODEL"] = model
+    os.environ["STT_BATCHING"] = "false"
+    from app.services.stt import get_stt
+    from app.services.video import VideoProcessor
+
+    audio = asyncio.run(VideoProcessor.extract_audio_pcm(audio_path))
+    stt = get_stt(backend)
+
+    started = time.perf_counter()
+    stt.warmup()
+    load = time.perf_counter() - started
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = asyncio.run(stt.transcribe(audio))
+        timings.append(time.perf_counter() - started)
+        if result.get("error"):
+            raise RuntimeError(result["error"])
+
+    print(json.dumps({
+        "load": load,
+        "rtf": min(timings) / (len(audio) / 16000),
+        # ru_maxrss is in KiB on Linux
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stt_backends")
+    parser.add_argument("--audio", required=True, help="audio or video file, ideally speech")
+    parser.add_argument("--backends", nargs="+", default=["whisper", "faster-whisper"])
+    parser.add_argument("--models", nargs="+", default=["tiny", "base", "small"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "MODEL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.audio, args.runs)
+        return
+
+    print(f"{'backend':>15} {'model':>8} {'load s':>8} {'RTF':>7} {'RSS MB':>8}")
+    for backend in args.backends:
+        for model in args.models:
+            proc = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.stt_backends",
+                    "--audio", args.audio, "--runs", str(args.runs),
+                    "--child", backend, model
+                ],
+                capture_output=True,
+                text=True
+            )
+            if proc.returncode != 0:
+                error = (proc.stderr.strip().splitlines() or ["failed"])[-1]
+                print(f"{backend:>15} {model:>8}  {error}")
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(
+                f"{backend:>15} {model:>8} {result['load']:8.1f} "
+                f"{result['rtf']:7.3f} {result['rss_mb']:8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
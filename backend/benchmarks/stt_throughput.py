@@ -0,0 +1,79 @@
+"""
+Transcription throughput: per-file Whisper vs cross-entry batching.
+
+Transcribes --entries copies of the same audio
+
+- ``per-file``: ``SpeechToText.transcribe`` one entry after another
+  (the worker's path without STT_BATCHING)
+- ``batched``: all entries at once through ``BatchTranscriber``
+
+and reports audio-seconds transcribed per wall-clock second. The model is
+warmed up first so loading isn't measured. Use speech for --audio;
+Whisper decodes silence or tones in a few tokens, which flatters both.
+
+    pip install openai-whisper
+    python -m benchmarks.stt_throughput --audio sample.wav --entries 16
+    python -m benchmarks.stt_throughput --audio sample.wav --batch-size 16 --model small
+"""
+import argparse
+import asyncio
+import os
+import time
+
+
+async def per_file(audio, entries: int):
+    from app.services.stt import SpeechToText
+
+    stt = SpeechToText()
+    for _ in range(entries):
+        result = await stt.transcribe(audio)
+        if result.get("error"):
+            raise RuntimeError(result["error"])
+
+
+async def batched(audio, entries: int):
+    from app.services.stt import BatchTranscriber
+
+    stt = BatchTranscriber()
+    results = await asyncio.gather(*(stt.transcribe(audio) for _ in range(entries)))
+    for result in results:
+        if result.get("error"):
+            raise RuntimeError(result["error"])
+
+
+def measure(name: str, func, audio, entries: int):
+    audio_seconds = entries * len(audio) / 16000
+    started = time.perf_counter()
+    asyncio.run(func(audio, entries))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:>8}: {audio_seconds:7.0f} audio-s in {elapsed:7.1f}s, "
+        f"{audio_seconds / elapsed:6.1f} audio-s/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stt_throughput")
+    parser.add_argument("--audio", required=True, help="audio or video file, ideally speech")
+    parser.add_argument("--entries", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=8, help="STT_BATCH_SIZE")
+    parser.add_argument("--max-wait-ms", type=int, default=200, help="STT_BATCH_MAX_WAIT_MS")
+    parser.add_argument("--model", default="base", help="WHISPER_MODEL")
+    args = parser.parse_args()
+
+    # Settings are read on import
+    os.environ["WHISPER_MODEL"] = args.model
+    os.environ["STT_BATCH_SIZE"] = str(args.batch_size)
+    os.environ["STT_BATCH_MAX_WAIT_MS"] = str(args.max_wait_ms)
+    import whisper
+    from app.services.stt import SpeechToText
+
+    audio = whisper.load_audio(args.audio)
+    SpeechToText().warmup()
+
+    measure("per-file", per_file, audio, args.entries)
+    measure("batched", batched, audio, args.entries)
+
+
+if __name__ == "__main__":
+    main()
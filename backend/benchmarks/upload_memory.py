@@ -0,0 +1,122 @@
+"""
+Peak memory of the /entries/upload storage path: whole-file read vs streaming.
+
+Uploads a generated file of --size-mb through
+
+- ``read``: ``await video.read()`` + one ``put_object`` (the old path)
+- ``stream``: ``StorageService.upload_stream`` (fixed-size multipart parts)
+
+against a local S3 stand-in and reports the peak Python heap allocation
+(tracemalloc) of each. Starts a moto server unless --endpoint points to a
+running MinIO.
+
+    pip install "moto[server]"
+    python -m benchmarks.upload_memory --size-mb 200
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_moto(port: int) -> subprocess.Popen:
+    """moto in its own process, so the objects it keeps aren't measured."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "moto.server", "-p", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("moto server did not start")
+
+
+def _make_upload(path: str):
+    """UploadFile over a file on disk, like Starlette's spooled request body."""
+    from fastapi import UploadFile
+    return UploadFile(open(path, "rb"), filename=os.path.basename(path))
+
+
+async def upload_read(storage, path: str) -> int:
+    video = _make_upload(path)
+    try:
+        data = await video.read()
+        await storage.upload_file("bench/read.webm", data, "video/webm")
+        return len(data)
+    finally:
+        await video.close()
+
+
+async def upload_stream(storage, path: str) -> int:
+    video = _make_upload(path)
+    try:
+        _, size = await storage.upload_stream("bench/stream.webm", video, "video/webm")
+        return size
+    finally:
+        await video.close()
+
+
+async def measure(name: str, func, storage, path: str):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = await func(storage, path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>6}: {size / 2**20:8.1f} MB uploaded in {elapsed:6.2f}s, peak heap {peak / 2**20:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.upload_memory")
+    parser.add_argument("--size-mb", type=int, default=200)
+    parser.add_argument("--part-size-mb", type=int, default=8)
+    parser.add_argument("--endpoint", default=None, help="host:port of a running MinIO (default: start moto)")
+    args = parser.parse_args()
+
+    server = None
+    if args.endpoint is None:
+        port = _free_port()
+        server = _start_moto(port)
+        args.endpoint = f"127.0.0.1:{port}"
+
+    # Settings are read on import
+    os.environ["MINIO_ENDPOINT"] = args.endpoint
+    os.environ["UPLOAD_PART_SIZE_MB"] = str(args.part_size_mb)
+    os.environ.setdefault("MINIO_BUCKET", "gunluk-bench")
+    from app.services.storage import StorageService
+
+    fd, path = tempfile.mkstemp(suffix=".webm")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            chunk = os.urandom(2**20)
+            for _ in range(args.size_mb):
+                f.write(chunk)
+
+        storage = StorageService()
+        asyncio.run(measure("read", upload_read, storage, path))
+        asyncio.run(measure("stream", upload_stream, storage, path))
+    finally:
+        os.remove(path)
+        if server is not None:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Shared fixtures.
+
+Database tests run against the PostgreSQL in DATABASE_URL (the CI job
+starts one) and are skipped when it isn't reachable. The schema is created
+from the models once per session and emptied after each test.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database import Base, SessionLocal, engine
+import app.models  # noqa: F401  (registers the tables on Base)
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    """Engine of a migrated, empty PostgreSQL database."""
+    if engine.dialect.name != "postgresql":
+        pytest.skip("DATABASE_URL is not a PostgreSQL database")
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        pytest.skip("PostgreSQL in DATABASE_URL is not reachable")
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db(pg_engine):
+    """Session on the test database; all tables are truncated afterwards."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        with pg_engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
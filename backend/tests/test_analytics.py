@@ -0,0 +1,44 @@
+import asyncio
+from datetime import datetime, time, timedelta
+
+from app.api.analytics import get_stats
+from app.database import AsyncSessionLocal, async_engine
+from app.models.entry import Entry
+from app.models.user import User
+from app.services.mood_stats import rebuild_daily_mood_stats
+
+
+def _stats(user: User):
+    async def run():
+        try:
+            async with AsyncSessionLocal() as session:
+                current_user = await session.get(User, user.id)
+                # Undecorated endpoint: no response cache in between
+                return await get_stats.__wrapped__(current_user=current_user, db=session)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_week_and_month_are_calendar_days(db):
+    user = User(email="stats@example.com", username="stats", hashed_password="x")
+    db.add(user)
+    db.flush()
+    today = datetime.utcnow().date()
+    for days_ago in (0, 6, 7, 29, 30):
+        db.add(Entry(
+            user_id=user.id,
+            recorded_at=datetime.combine(today - timedelta(days=days_ago), time(0, 0)),
+            duration_seconds=60
+        ))
+    db.flush()
+    rebuild_daily_mood_stats(db, user.id)
+    db.commit()
+
+    stats = _stats(user)
+
+    assert stats.total_entries == 5
+    # Today and the 6 / 29 days before it, whatever the time of day
+    assert stats.entries_this_week == 2
+    assert stats.entries_this_month == 4
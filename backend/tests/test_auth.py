@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+from fastapi.routing import APIRoute
+
+from app.config import settings
+from app.database import async_engine
+from app.main import app
+from app.services.cache import UserCache
+from app.utils.security import get_current_user
+
+
+def test_issued_tokens_authenticate(pg_engine, db, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                registered = await client.post("/api/auth/register", json={
+                    "email": "token@example.com", "username": "token", "password": "correct horse"
+                })
+                assert registered.status_code == 201, registered.text
+                logged_in = await client.post("/api/auth/login", data={
+                    "username": "token@example.com", "password": "correct horse"
+                })
+                assert logged_in.status_code == 200, logged_in.text
+
+                responses = []
+                for token in (registered.json()["access_token"], logged_in.json()["access_token"]):
+                    responses.append(await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}))
+                return responses
+        finally:
+            await async_engine.dispose()
+
+    for response in asyncio.run(run()):
+        assert response.status_code == 200, response.text
+        assert response.json()["username"] == "token"
+
+
+def _needs_user(dependant) -> bool:
+    return any(
+        dependency.call is get_current_user or _needs_user(dependency)
+        for dependency in dependant.dependencies
+    )
+
+
+# Requests for the routes that need more than their path
+REQUESTS = {
+    ("PUT", "/api/auth/me"): {"json": {"full_name": "Yeni Ad"}},
+    ("POST", "/api/auth/change-password"): {
+        "params": {"current_password": "correct horse", "new_password": "battery staple"}
+    },
+    ("POST", "/api/entries/"): {"json": {"title": "Bugün", "mood": "happy", "mood_intensity": 6}},
+    ("PUT", "/api/entries/{entry_id}"): {"json": {"title": "Yarın"}},
+}
+# Needs object storage
+SKIPPED = {("POST", "/api/entries/upload")}
+
+
+def test_handlers_work_on_a_cached_user_snapshot(pg_engine, db, monkeypatch):
+    """
+    Every authenticated route, served from the user snapshot.
+
+    Columns outside UserCache.SNAPSHOT_FIELDS aren't loaded on such a
+    user; a handler reading one without refreshing it raises
+    MissingGreenlet here.
+    """
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    routes = [
+        (method, route.path)
+        for route in app.routes if isinstance(route, APIRoute) and _needs_user(route.dependant)
+        for method in route.methods
+        if (method, route.path) not in SKIPPED
+    ]
+    # Deleting goes last, the entry is needed until then
+    routes.sort(key=lambda route: route[0] == "DELETE")
+    assert ("GET", "/api/analytics/stats") in routes
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                registered = await client.post("/api/auth/register", json={
+                    "email": "snapshot@example.com", "username": "snapshot", "password": "correct horse"
+                })
+                client.headers["Authorization"] = f"Bearer {registered.json()['access_token']}"
+                created = await client.post("/api/entries/", json={"title": "İlk", "mood": "happy"})
+                entry_id = created.json()["id"]
+
+                statuses = {}
+                for method, path in routes:
+                    # Loads the user into UserCache if a write dropped it
+                    assert (await client.get("/api/auth/me")).status_code == 200
+                    response = await client.request(
+                        method, path.format(entry_id=entry_id), **REQUESTS.get((method, path), {})
+                    )
+                    statuses[method, path] = response.status_code
+                return statuses
+        finally:
+            await async_engine.dispose()
+
+    UserCache()._users.clear()
+    for route, status_code in asyncio.run(run()).items():
+        assert status_code < 400, route
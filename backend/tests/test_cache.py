@@ -0,0 +1,151 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import async_engine
+from app.main import app
+from app.models.user import User
+from app.services import cache
+from app.services.cache import ResponseCache, bump_entries_version
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def user(db):
+    """A user with an API token, and an empty response cache."""
+    user = User(email="cache@example.com", username="cache", hashed_password="x")
+    db.add(user)
+    db.commit()
+    response_cache = ResponseCache()
+    response_cache._responses.clear()
+    response_cache.hits.clear()
+    response_cache.misses.clear()
+    return user, create_access_token(data={"sub": str(user.id)})
+
+
+def run_as(token: str, scenario):
+    """Run ``scenario(client)`` against the app with the token's user."""
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        headers = {"Authorization": f"Bearer {token}"}
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+                return await scenario(client)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def _stats(client) -> dict:
+    response = await client.get("/api/analytics/stats")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def _counters(client) -> dict:
+    response = await client.get("/metrics")
+    assert response.status_code == 200, response.text
+    return response.json()["response_cache"]["endpoints"]["stats"]
+
+
+def test_miss_then_hit(user):
+    async def scenario(client):
+        first = await _stats(client)
+        after_miss = await _counters(client)
+        second = await _stats(client)
+        return first, second, after_miss, await _counters(client)
+
+    first, second, after_miss, after_hit = run_as(user[1], scenario)
+
+    assert first == second
+    assert (after_miss["hits"], after_miss["misses"]) == (0, 1)
+    assert after_hit == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_write_through_the_api_invalidates(user):
+    async def scenario(client):
+        before = await _stats(client)
+        response = await client.post("/api/entries/", json={"title": "Bugün", "mood": "happy", "mood_intensity": 6})
+        assert response.status_code == 201, response.text
+        return before, await _stats(client), await _counters(client)
+
+    before, after, counters = run_as(user[1], scenario)
+
+    assert (before["total_entries"], after["total_entries"]) == (0, 1)
+    assert counters["misses"] == 2 and counters["hits"] == 0
+
+
+def test_bump_entries_version_invalidates(db, user):
+    run_as(user[1], _stats)
+    bump_entries_version(db, user[0].id)
+    db.commit()
+
+    async def scenario(client):
+        await _stats(client)
+        return await _counters(client)
+
+    counters = run_as(user[1], scenario)
+
+    assert (counters["hits"], counters["misses"]) == (0, 2)
+
+
+def test_stats_is_one_version_lookup_and_one_query(user):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def scenario(client):
+        # Warm the auth cache, so the request doesn't load the user
+        assert (await client.get("/api/auth/me")).status_code == 200
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            await _stats(client)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    run_as(user[1], scenario)
+
+    # ETag and response cache share the version; streaks come with the totals
+    assert len(statements) == 2
+    assert "entries_version" in statements[0]
+    assert "current_streak" in statements[1] and "daily_mood_stats" in statements[1]
+
+
+class UnreachableRedis:
+    """Redis client whose every call fails like a refused connection."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        raise ConnectionError("Connection refused")
+
+    async def set(self, key, value, ex=None):
+        self.calls += 1
+        raise ConnectionError("Connection refused")
+
+
+def test_unreachable_redis_falls_back_to_memory(user, monkeypatch):
+    redis = UnreachableRedis()
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_REDIS", True)
+    monkeypatch.setattr(cache, "_redis", redis)
+    monkeypatch.setattr(cache, "_redis_down_until", 0.0)
+
+    async def scenario(client):
+        for _ in range(3):
+            await _stats(client)
+        response = await client.get("/metrics")
+        return response.json()["response_cache"]
+
+    metrics = run_as(user[1], scenario)
+
+    # One failed call opens the circuit; the rest are served in-process
+    assert redis.calls == 1
+    assert metrics["backend"] == "memory"
+    assert metrics["endpoints"]["stats"] == {"hits": 2, "misses": 1, "hit_ratio": 2 / 3}
@@ -0,0 +1,82 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.api.entries import decode_cursor, encode_cursor
+from app.database import async_engine
+from app.main import app
+from app.models.entry import Entry
+from app.models.user import User
+from app.utils.security import create_access_token
+
+
+def _encode(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    recorded_at = datetime(2026, 10, 17, 9, 30, 15, 123456)
+    cursor = encode_cursor(Entry(id=42, recorded_at=recorded_at))
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (recorded_at, 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    _encode({"recorded_at": "2026-10-17T09:00:00", "id": 1}),
+    _encode(["2026-10-17T09:00:00"]),
+    _encode(["2026-10-17T09:00:00", 1, 2]),
+    _encode(["yesterday", 1]),
+    _encode(["2026-10-17T09:00:00", None]),
+    _encode(7),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.detail == "Geçersiz sayfa imleci (cursor)"
+
+
+def test_decoded_cursor_is_naive_utc():
+    cursor = _encode(["2026-10-17T12:00:00+03:00", 5])
+
+    assert decode_cursor(cursor) == (datetime(2026, 10, 17, 9, 0), 5)
+
+
+def test_aware_timestamps_are_stored_and_filtered_as_utc(db):
+    user = User(email="tz@example.com", username="tz", hashed_password="x")
+    db.add(user)
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(user.id)})}"}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+                created = await client.post("/api/entries/", json={"recorded_at": "2026-10-17T01:30:00+03:00"})
+                assert created.status_code == 201, created.text
+                updated = await client.put(f"/api/entries/{created.json()['id']}", json={
+                    "recorded_at": "2026-10-16T23:30:00-02:00"
+                })
+                assert updated.status_code == 200, updated.text
+                listed = await client.get("/api/entries/", params={
+                    "start_date": "2026-10-17T03:00:00+02:00",
+                    "end_date": "2026-10-17T01:30:00Z",
+                })
+                assert listed.status_code == 200, listed.text
+                return updated.json(), listed.json()
+        finally:
+            await async_engine.dispose()
+
+    updated, listed = asyncio.run(run())
+
+    assert updated["recorded_at"] == "2026-10-17T01:30:00"
+    assert [item["id"] for item in listed["items"]] == [updated["id"]]
@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.database import async_engine
+from app.main import app
+from app.models.user import User
+from app.services.cache import ResponseCache
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def users(db):
+    """Two users, each with an API token."""
+    created = [
+        User(email=f"{name}@example.com", username=name, hashed_password="x")
+        for name in ("etag-a", "etag-b")
+    ]
+    db.add_all(created)
+    db.commit()
+    ResponseCache()._responses.clear()
+    return [create_access_token(data={"sub": str(user.id)}) for user in created]
+
+
+def run_as(token: str, scenario):
+    """Run ``scenario(client)`` against the app with the token's user."""
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        headers = {"Authorization": f"Bearer {token}"}
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+                return await scenario(client)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def _create_entry(client) -> int:
+    response = await client.post("/api/entries/", json={"title": "Bugün", "mood": "happy", "mood_intensity": 6})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def _etag(client, path: str) -> str:
+    response = await client.get(path)
+    assert response.status_code == 200, response.text
+    assert response.headers["Cache-Control"]
+    return response.headers["ETag"]
+
+
+async def _revalidate(client, path: str, etag: str) -> int:
+    return (await client.get(path, headers={"If-None-Match": etag})).status_code
+
+
+def test_if_none_match_answers_304(users):
+    async def scenario(client):
+        entry_id = await _create_entry(client)
+        statuses = {}
+        for path in ("/api/entries/", f"/api/entries/{entry_id}", "/api/analytics/stats"):
+            etag = await _etag(client, path)
+            response = await client.get(path, headers={"If-None-Match": etag})
+            statuses[path] = (response.status_code, response.headers.get("ETag") == etag, response.content)
+            # Also in a list and as a weak validator
+            statuses[path + " list"] = await _revalidate(client, path, f'"other", W/{etag}')
+        return statuses
+
+    for path, result in run_as(users[0], scenario).items():
+        if path.endswith(" list"):
+            assert result == 304, path
+        else:
+            assert result == (304, True, b""), path
+
+
+@pytest.mark.parametrize("write", ["create", "favorite", "delete"])
+def test_etags_change_after_a_write(users, write):
+    async def scenario(client):
+        entry_id = await _create_entry(client)
+        other_id = await _create_entry(client)
+        paths = ["/api/entries/", "/api/analytics/stats"]
+        if write == "favorite":
+            paths.append(f"/api/entries/{entry_id}")
+        before = {path: await _etag(client, path) for path in paths}
+
+        if write == "create":
+            await _create_entry(client)
+        elif write == "favorite":
+            assert (await client.post(f"/api/entries/{entry_id}/favorite")).status_code == 200
+        else:
+            assert (await client.delete(f"/api/entries/{other_id}")).status_code == 204
+
+        return {path: await _revalidate(client, path, etag) for path, etag in before.items()}
+
+    for path, status_code in run_as(users[0], scenario).items():
+        assert status_code == 200, path
+
+
+def test_etags_are_per_user(users):
+    async def first_user(client):
+        entry_id = await _create_entry(client)
+        return entry_id, {
+            path: await _etag(client, path)
+            for path in ("/api/entries/", "/api/analytics/stats", f"/api/entries/{entry_id}")
+        }
+
+    entry_id, etags = run_as(users[0], first_user)
+
+    async def second_user(client):
+        # Same entries_version and query string; only the user differs
+        await _create_entry(client)
+        return {path: await _revalidate(client, path, etag) for path, etag in etags.items()}
+
+    statuses = run_as(users[1], second_user)
+
+    assert statuses["/api/entries/"] == 200
+    assert statuses["/api/analytics/stats"] == 200
+    # Someone else's entry is not found, whatever the validator
+    assert statuses[f"/api/entries/{entry_id}"] == 404
@@ -0,0 +1,157 @@
+"""
+Alembic revisions against a scratch database next to the test one.
+
+Covers a fresh ``upgrade head``, the data backfills, and the documented
+path for databases created by ``create_all`` at startup: ``stamp 0001``,
+then upgrade.
+"""
+import os
+from datetime import date
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.models.job import ProcessingJob
+from app.models.mood_stat import DailyMoodStat
+from app.models.transcript import TranscriptSegment
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def scratch_url(pg_engine, monkeypatch):
+    """URL of an empty database; alembic's env.py reads settings.DATABASE_URL."""
+    url = make_url(settings.DATABASE_URL)
+    url = url.set(database=f"{url.database}_migrations")
+    admin = pg_engine.execution_options(isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}"'))
+        conn.execute(text(f'CREATE DATABASE "{url.database}"'))
+
+    monkeypatch.setattr(settings, "DATABASE_URL", url.render_as_string(hide_password=False))
+    yield url
+
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)'))
+
+
+@pytest.fixture
+def alembic_config():
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return config
+
+
+def _schema(url):
+    engine = create_engine(url)
+    try:
+        inspector = inspect(engine)
+        return {
+            table: {column["name"] for column in inspector.get_columns(table)}
+            for table in inspector.get_table_names()
+        }
+    finally:
+        engine.dispose()
+
+
+def test_upgrade_and_downgrade(scratch_url, alembic_config):
+    command.upgrade(alembic_config, "head")
+    schema = _schema(scratch_url)
+    assert {"users", "entries", "processing_jobs", "transcript_segments", "daily_mood_stats"} <= set(schema)
+    assert {"current_streak", "longest_streak", "last_entry_date", "entries_version"} <= schema["users"]
+
+    command.downgrade(alembic_config, "base")
+    assert set(_schema(scratch_url)) == {"alembic_version"}
+
+
+def test_baseline_has_only_original_tables(scratch_url, alembic_config):
+    command.upgrade(alembic_config, "0001")
+    schema = _schema(scratch_url)
+    assert set(schema) == {"alembic_version", "users", "entries"}
+    assert "current_streak" not in schema["users"]
+
+
+def test_stamped_create_all_database_upgrades(scratch_url, alembic_config):
+    # What create_all at startup left behind: the baseline, later tables
+    # it added on restarts, and on fresh installs the streak columns
+    command.upgrade(alembic_config, "0001")
+    engine = create_engine(scratch_url)
+    try:
+        tables = [ProcessingJob.__table__, TranscriptSegment.__table__, DailyMoodStat.__table__]
+        for table in tables:
+            table.create(engine)
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE users ADD COLUMN current_streak INTEGER"))
+    finally:
+        engine.dispose()
+
+    command.upgrade(alembic_config, "head")
+    schema = _schema(scratch_url)
+    assert {"current_streak", "longest_streak", "last_entry_date"} <= schema["users"]
+
+
+def test_upgrade_backfills_mood_rollup(scratch_url, alembic_config):
+    command.upgrade(alembic_config, "0008")
+    engine = create_engine(scratch_url)
+    try:
+        with engine.begin() as conn:
+            user_id = conn.execute(text(
+                "INSERT INTO users (email, username, hashed_password) "
+                "VALUES ('old@example.com', 'old', 'x') RETURNING id"
+            )).scalar_one()
+            conn.execute(text(
+                "INSERT INTO entries (user_id, recorded_at, mood, mood_intensity, duration_seconds) VALUES "
+                "(:user_id, '2026-10-01 09:00', 'HAPPY', 7, 30), "
+                "(:user_id, '2026-10-01 21:00', 'TIRED', 4, 45), "
+                "(:user_id, '2026-10-03 08:00', NULL, NULL, 10)"
+            ), {"user_id": user_id})
+
+        command.upgrade(alembic_config, "0009")
+
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT date, entry_count, duration_seconds, dominant_mood "
+                "FROM daily_mood_stats ORDER BY date"
+            )).all()
+    finally:
+        engine.dispose()
+
+    assert [tuple(row) for row in rows] == [
+        (date(2026, 10, 1), 2, 75.0, "happy"),
+        (date(2026, 10, 3), 1, 10.0, None),
+    ]
+
+
+def test_upgrade_backfills_streaks(scratch_url, alembic_config):
+    # Entries from before the rollup: 0010 reads what 0009 rebuilt
+    command.upgrade(alembic_config, "0008")
+    engine = create_engine(scratch_url)
+    try:
+        with engine.begin() as conn:
+            user_id = conn.execute(text(
+                "INSERT INTO users (email, username, hashed_password) "
+                "VALUES ('old@example.com', 'old', 'x') RETURNING id"
+            )).scalar_one()
+            conn.execute(text(
+                "INSERT INTO entries (user_id, recorded_at) VALUES "
+                "(:user_id, '2026-09-01 09:00'), "
+                "(:user_id, '2026-09-02 09:00'), "
+                "(:user_id, '2026-09-02 21:00'), "
+                "(:user_id, '2026-09-03 09:00'), "
+                "(:user_id, '2026-10-01 09:00')"
+            ), {"user_id": user_id})
+
+        command.upgrade(alembic_config, "0010")
+
+        with engine.connect() as conn:
+            row = conn.execute(text(
+                "SELECT last_entry_date, current_streak, longest_streak FROM users"
+            )).one()
+    finally:
+        engine.dispose()
+
+    assert tuple(row) == (date(2026, 10, 1), 1, 3)
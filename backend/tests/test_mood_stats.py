@@ -0,0 +1,66 @@
+import threading
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from app.database import SessionLocal
+from app.models.entry import Entry
+from app.models.mood_stat import DailyMoodStat
+from app.models.user import User
+from app.services.mood_stats import refresh_daily_mood_stats
+
+DAY = date(2026, 10, 17)
+
+
+def _add_entry(session, user_id: int, hour: int):
+    session.add(Entry(user_id=user_id, recorded_at=datetime(2026, 10, 17, hour), duration_seconds=60))
+    session.flush()
+
+
+def test_concurrent_refreshes_keep_both_entries(db):
+    user = User(email="rollup@example.com", username="rollup", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    first = SessionLocal()
+    first.execute(text("SET lock_timeout = '5s'"))
+    inserted = threading.Event()
+    go = threading.Event()
+    errors = []
+
+    def second_writer():
+        session = SessionLocal()
+        try:
+            _add_entry(session, user_id, 12)
+            inserted.set()
+            go.wait(5)
+            refresh_daily_mood_stats(session, user_id, [DAY])
+            session.commit()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    try:
+        # Both entries are inserted (and hold key-share locks on the
+        # user row) before either transaction refreshes the rollup
+        _add_entry(first, user_id, 9)
+        second = threading.Thread(target=second_writer)
+        second.start()
+        assert inserted.wait(5)
+
+        refresh_daily_mood_stats(first, user_id, [DAY])
+        go.set()
+        second.join(0.5)
+        # Waits for the first transaction instead of computing without it
+        assert second.is_alive()
+        first.commit()
+        second.join(5)
+    finally:
+        first.close()
+
+    assert not errors
+    stat = db.query(DailyMoodStat).filter(DailyMoodStat.user_id == user_id).one()
+    assert stat.entry_count == 2
+    assert stat.duration_seconds == 120
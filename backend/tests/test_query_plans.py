@@ -0,0 +1,165 @@
+"""
+Query plan regression tests.
+
+Each endpoint is requested through the app for a user with a long diary,
+among a few hundred others; the statements it sends are captured and
+EXPLAINed with the same parameters. The tests fail when a query stops using the index it
+was written for (see alembic/versions/0002 and 0003), e.g. because a filter
+no longer matches an expression index.
+"""
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+from sqlalchemy import event, text
+
+from app.database import Base, async_engine
+from app.api.entries import encode_cursor
+from app.main import app
+from app.models.entry import Entry
+from app.services.cache import ResponseCache
+from app.utils.security import create_access_token
+
+USERS = 200
+ENTRIES_PER_USER = 100
+# The user under test keeps a long diary; a handful of its entries are tagged "rare"
+PLAN_USER_ENTRIES = 20000
+
+
+@pytest.fixture(scope="module")
+def plan_user(pg_engine):
+    """Id of the user with PLAN_USER_ENTRIES entries among USERS users, analyzed."""
+    with pg_engine.begin() as conn:
+        conn.execute(text("SELECT setseed(0.42)"))
+        user_ids = conn.execute(text("""
+            INSERT INTO users (email, username, hashed_password, is_active, is_premium, entries_version)
+            SELECT 'plan' || g || '@example.com', 'plan' || g, 'x', true, false, 0
+            FROM generate_series(1, :users) g
+            RETURNING id
+        """), {"users": USERS}).scalars().all()
+        conn.execute(text("""
+            INSERT INTO entries (
+                user_id, recorded_at, created_at, updated_at, duration_seconds, mood, mood_intensity,
+                manual_tags, auto_tags, is_favorite, is_private, is_processed
+            )
+            SELECT
+                CASE WHEN g <= :plan_entries THEN :first_user ELSE :first_user + 1 + (g % (:users - 1)) END,
+                now() - random() * interval '1095 days',
+                now(), now(), 60,
+                (ARRAY['HAPPY', 'SAD', 'NEUTRAL', 'TIRED', 'PEACEFUL'])[1 + floor(random() * 5)::int]::moodtype,
+                5,
+                CASE WHEN g % 1000 = 0 THEN '["rare"]'::jsonb
+                     ELSE jsonb_build_array('tag' || floor(power(random(), 3) * 200)::int) END,
+                jsonb_build_array('tag' || floor(power(random(), 3) * 200)::int),
+                random() < 0.03, true, true
+            FROM generate_series(1, :entries) g
+        """), {
+            "first_user": user_ids[0],
+            "users": USERS,
+            "plan_entries": PLAN_USER_ENTRIES,
+            "entries": PLAN_USER_ENTRIES + (USERS - 1) * ENTRIES_PER_USER,
+        })
+
+        # The rollup's shape is enough for planning; see mood_stats for the real one
+        conn.execute(text("""
+            INSERT INTO daily_mood_stats (
+                user_id, date, entry_count, duration_seconds, mood_counts, intensity_sums,
+                dominant_mood, dominant_intensity
+            )
+            SELECT user_id, recorded_at::date, count(*), sum(duration_seconds),
+                   json_build_object(lower(min(mood::text)), count(*)),
+                   json_build_object(lower(min(mood::text)), sum(mood_intensity)),
+                   lower(min(mood::text)), max(mood_intensity)
+            FROM entries
+            GROUP BY user_id, recorded_at::date
+        """))
+
+    with pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    yield user_ids[0]
+
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with pg_engine.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+
+def _scans(plan: dict):
+    """(node type, relation, index) of every scan in a JSON plan."""
+    if "Relation Name" in plan or "Index Name" in plan:
+        yield plan["Node Type"], plan.get("Relation Name"), plan.get("Index Name")
+    for child in plan.get("Plans", []):
+        yield from _scans(child)
+
+
+def request_scans(user_id: int, path: str):
+    """
+    Request ``path`` as the user and EXPLAIN what it sent to the database.
+
+    Returns:
+        One set of (node type, relation, index) per SELECT statement
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    async def run():
+        token = create_access_token(data={"sub": str(user_id), "email": f"plan{user_id}@example.com"})
+        transport = httpx.ASGITransport(app=app)
+        try:
+            event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+            finally:
+                event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+            assert response.status_code == 200, response.text
+
+            plans = []
+            async with async_engine.connect() as conn:
+                for statement, parameters in statements:
+                    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                    plan = result.scalar_one()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    plans.append(set(_scans(plan[0]["Plan"])))
+            return plans
+        finally:
+            await async_engine.dispose()
+
+    # Responses would otherwise be served without touching the database
+    ResponseCache()._responses.clear()
+    return asyncio.run(run())
+
+
+def _cursor():
+    return encode_cursor(Entry(id=10 ** 9, recorded_at=datetime.utcnow()))
+
+
+# Endpoint -> indexes its queries must use. Other indexes may show up too
+PLANS = {
+    "/api/entries/": {"ix_entries_user_recorded", "uq_daily_mood_stats_user_date"},
+    "/api/entries/?cursor={cursor}": {"ix_entries_user_recorded"},
+    "/api/entries/?start_date=2026-01-01T00:00:00": {"ix_entries_user_recorded"},
+    "/api/entries/?favorites_only=true": {"ix_entries_user_favorite"},
+    "/api/entries/?mood=happy": {"ix_entries_user_mood"},
+    "/api/entries/?tag=rare": {"ix_entries_manual_tags_gin", "ix_entries_auto_tags_gin"},
+    "/api/analytics/stats": {"uq_daily_mood_stats_user_date"},
+    "/api/analytics/mood-heatmap": {"uq_daily_mood_stats_user_date"},
+    "/api/analytics/mood-trends": {"uq_daily_mood_stats_user_date"},
+    "/api/analytics/day-of-week": {"uq_daily_mood_stats_user_date"},
+    "/api/analytics/on-this-day": {"ix_entries_user_month_day"},
+}
+
+
+@pytest.mark.parametrize("path", PLANS)
+def test_endpoint_uses_its_indexes(plan_user, path):
+    scans = set().union(*request_scans(plan_user, path.format(cursor=_cursor())))
+
+    assert PLANS[path] <= {index for _, _, index in scans}
+    # users is a few pages here, a sequential scan is the cheapest
+    assert not [scan for scan in scans if scan[0] == "Seq Scan" and scan[1] != "users"]
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models.entry import Entry
+from app.models.job import ProcessingJob, JobStatus
+from app.models.user import User
+from app.services.queue import JobQueue, JobLostError
+
+
+@pytest.fixture
+def queue(db):
+    user = User(email="queue@example.com", username="queue", hashed_password="x")
+    db.add(user)
+    db.flush()
+    entry = Entry(user_id=user.id, video_key="entries/1/video.webm")
+    db.add(entry)
+    db.flush()
+    queue = JobQueue(db)
+    queue.enqueue(entry.id)
+    db.commit()
+    return queue
+
+
+def expire_lock(db, job):
+    job.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+
+def test_claim_marks_job_running(queue):
+    job = queue.claim("worker-a")
+
+    assert job.status == JobStatus.RUNNING
+    assert job.stage == "media"
+    assert job.attempts == 1
+    assert job.locked_by == "worker-a"
+    assert job.locked_until > datetime.utcnow()
+
+
+def test_running_job_is_not_claimed_twice(queue, db):
+    assert queue.claim("worker-a") is not None
+    assert JobQueue(db).claim("worker-b") is None
+
+
+def test_advance_runs_every_stage_then_finishes(queue):
+    job = queue.claim("worker-a")
+
+    assert queue.advance(job, "worker-a")
+    assert job.stage == "transcribe"
+    # The next stage runs in the same claim, so that is its first attempt
+    assert job.attempts == 1
+    assert job.status == JobStatus.RUNNING
+
+    assert queue.advance(job, "worker-a")
+    assert job.stage == "analyze"
+    assert not queue.advance(job, "worker-a")
+    assert job.status == JobStatus.DONE
+    assert job.locked_by is None
+
+
+def test_failed_stage_is_retried_with_backoff(queue):
+    job = queue.claim("worker-a")
+
+    assert queue.fail(job, "worker-a", "boom")
+    assert job.status == JobStatus.PENDING
+    assert job.last_error == "boom"
+    assert job.locked_by is None
+    assert job.run_after > datetime.utcnow() + timedelta(seconds=settings.JOB_RETRY_BACKOFF_SECONDS - 5)
+    # Not runnable before the backoff has passed
+    assert queue.claim("worker-a") is None
+
+
+def test_stage_gives_up_after_max_attempts(queue, db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 0)
+    job = queue.claim("worker-a")
+    queue.advance(job, "worker-a")
+
+    for attempt in range(1, settings.JOB_MAX_ATTEMPTS):
+        assert queue.fail(job, "worker-a", f"failure {attempt}")
+        job = queue.claim("worker-a")
+        assert job.stage == "transcribe"
+        assert job.attempts == attempt + 1
+
+    assert not queue.fail(job, "worker-a", "last failure")
+    assert job.status == JobStatus.FAILED
+    assert queue.claim("worker-a") is None
+
+
+def test_expired_job_is_reclaimed_and_old_worker_is_fenced(queue, db):
+    job = queue.claim("worker-a")
+    expire_lock(db, job)
+
+    job_b = JobQueue(db).claim("worker-b")
+    assert job_b.id == job.id
+    assert job_b.locked_by == "worker-b"
+    assert job_b.attempts == 2
+
+    with pytest.raises(JobLostError):
+        queue.heartbeat(job.id, "worker-a")
+    with pytest.raises(JobLostError):
+        queue.advance(job, "worker-a")
+    with pytest.raises(JobLostError):
+        queue.fail(job, "worker-a", "late failure")
+
+    stored = db.get(ProcessingJob, job.id)
+    assert stored.status == JobStatus.RUNNING
+    assert stored.stage == "media"
+    assert stored.locked_by == "worker-b"
+    assert stored.last_error is None
+
+
+def test_advance_of_lost_job_discards_stage_results(queue, db):
+    job = queue.claim("worker-a")
+    expire_lock(db, job)
+    JobQueue(db).claim("worker-b")
+
+    entry = db.get(Entry, job.entry_id)
+    entry.transcript = "stale result"
+    with pytest.raises(JobLostError):
+        queue.advance(job, "worker-a")
+
+    assert db.get(Entry, job.entry_id).transcript is None
+
+
+def test_job_timing_out_too_often_fails(queue, db):
+    for _ in range(settings.JOB_MAX_ATTEMPTS):
+        job = queue.claim("worker-a")
+        expire_lock(db, job)
+
+    assert queue.claim("worker-a") is None
+    job = db.get(ProcessingJob, job.id)
+    assert job.status == JobStatus.FAILED
+    assert job.last_error == "Visibility timeout exceeded"
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+from multiprocessing.connection import Listener
+
+import pytest
+
+from app.config import settings
+from app.model_server import ModelServer
+from app.services.stt import BatchTranscriber, RemoteSpeechToText, SpeechToText, get_stt
+
+
+def test_model_server_starts_with_batching(monkeypatch):
+    monkeypatch.setattr(settings, "STT_BATCHING", True)
+    monkeypatch.setattr(settings, "MODEL_SERVER_STT_BACKEND", "whisper")
+
+    loop = asyncio.new_event_loop()
+    try:
+        server = ModelServer(loop)
+    finally:
+        loop.close()
+    assert isinstance(server.stt, BatchTranscriber)
+    assert "detect_language" in server.ops
+
+
+def test_batch_detect_language_uses_shared_model(monkeypatch):
+    async def detect_language(self, audio):
+        return "en"
+
+    monkeypatch.setattr(SpeechToText, "detect_language", detect_language)
+    monkeypatch.setattr(settings, "STT_BATCHING", True)
+    assert asyncio.run(get_stt("whisper").detect_language("audio.wav")) == "en"
+
+
+def _serve_ping(address: str, delay: float):
+    """Start a model-server stand-in after ``delay`` and answer one ping."""
+    time.sleep(delay)
+    with Listener(address, family="AF_UNIX", authkey=settings.SECRET_KEY.encode()) as listener:
+        with listener.accept() as conn:
+            conn.recv()
+            conn.send(("ok", "pong"))
+
+
+def test_remote_warmup_waits_for_server(tmp_path, monkeypatch):
+    address = str(tmp_path / "models.sock")
+    monkeypatch.setattr(settings, "MODEL_SERVER_SOCKET", address)
+    server = threading.Thread(target=_serve_ping, args=(address, 0.5))
+    server.start()
+    try:
+        RemoteSpeechToText().warmup()
+    finally:
+        server.join(timeout=5)
+
+
+def test_remote_warmup_gives_up_after_deadline(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_SERVER_SOCKET", str(tmp_path / "missing.sock"))
+    monkeypatch.setattr(settings, "MODEL_SERVER_WAIT_SECONDS", 0)
+    with pytest.raises(TimeoutError):
+        RemoteSpeechToText().warmup()
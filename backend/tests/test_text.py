@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from app.services.ai import AIService, KeywordIndex
+from app.utils.text import stem, stem_forms, tokenize, turkish_lower, vocabulary_form
+
+
+def test_turkish_lower():
+    assert turkish_lower("İstanbul IĞDIR") == "istanbul ığdır"
+
+
+def test_tokenize():
+    assert tokenize("Bugün İŞ çok yoğundu, ama güzel!") == ["bugün", "iş", "çok", "yoğundu", "ama", "güzel"]
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("yemeği", "yemek"),
+    ("yemek", "yemek"),
+    ("arkadaşlarımla", "arkadaş"),
+    ("işte", "iş"),
+    ("kitaplar", "kitap"),
+])
+def test_stem(token, expected):
+    assert stem(token) == expected
+
+
+def test_stem_does_not_strip_into_buffer_consonant():
+    # "eşya" is not "eş" + "ya"
+    assert stem("eşya") != "eş"
+
+
+def test_stem_forms_follow_every_reading():
+    assert {"oyun", "oyu"} <= stem_forms("oyunda")
+    assert {"dizi", "diz"} <= stem_forms("diziler")
+    assert stem_forms("oylar") == {"oylar", "oy"}
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("dizi", "dizi"),
+    ("oyun", "oyun"),
+    ("parti", "parti"),
+    ("kahve", "kahve"),
+    ("kazandım", "kazan"),
+    ("tamamladım", "tamamla"),
+])
+def test_vocabulary_form(word, expected):
+    assert vocabulary_form(word) == expected
+
+
+@pytest.fixture(scope="module")
+def index():
+    return KeywordIndex(["dizi", "oyun", "parti", "kahve", "iş", "kazandım", "akşam yemeği"])
+
+
+def _match(index, text):
+    return index.match(tokenize(text))
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Inflected forms of the dictionary word
+    ("Diziyi izledik", {"dizi"}),
+    ("Yeni diziler başladı", {"dizi"}),
+    ("Oyunda kaybettik", {"oyun"}),
+    ("Partiye geç kaldım", {"parti"}),
+    ("Kahvemi içtim", {"kahve"}),
+    ("İşte yoğun bir gün", {"iş"}),
+    ("Maçı kazandık", {"kazandım"}),
+    ("Akşam yemeğinde buluştuk", {"akşam yemeği"}),
+    # Shorter words the old stems collided with
+    ("Diz kapağım ağrıyor", set()),
+    ("Dizlerim ağrıyor", set()),
+    ("Seçimde oy kullandım", set()),
+    ("Oylar sayıldı", set()),
+    ("Par üç deliği", set()),
+    ("Kişi başı ödedik", set()),
+    ("Tamam dedim", set()),
+    ("Akşam eve döndüm", set()),
+])
+def test_keyword_index_match(index, text, expected):
+    assert _match(index, text) == expected
+
+
+def test_auto_tag_ignores_stem_collisions():
+    tags = asyncio.run(AIService().auto_tag("Dizlerim ağrıyordu ama seçimde oy kullandım"))
+    assert "eğlence" not in tags
+
+
+def test_auto_tag_inflected_vocabulary():
+    tags = asyncio.run(AIService().auto_tag("Akşam arkadaşlarla diziler izledik, sonra partiye gittik"))
+    assert {"eğlence", "arkadaş"} <= set(tags)
+
+
+def test_term_matrix_counts_repeats():
+    ai = AIService()
+    counts = ai._term_matrix(["Kahve içtim. Bir kahve daha, sonra kahvaltı", None])
+
+    assert counts[0, ai._vocabulary_ids["kahve"]] == 2
+    assert counts[0, ai._vocabulary_ids["kahvaltı"]] == 1
+    assert counts[0].sum() == 3
+    assert not counts[1].any()
+
+
+def test_score_batch_matches_per_text_scoring():
+    texts = [
+        "Çok mutlu bir gün. Mutlu mutlu dolaştık ama akşam yorgun ve üzgündüm",
+        "Harika bir film izledik, film çok güzeldi. Sonra kahve içtik",
+        "Toplantı toplantı toplantı. Proje stresli, çok endişeliyim",
+        "",
+        None,
+    ]
+    ai = AIService()
+    tags, sentiments = ai.score_batch(texts)
+
+    for text, text_tags, sentiment in zip(texts, tags, sentiments):
+        assert text_tags == asyncio.run(ai.auto_tag(text))
+        assert sentiment == pytest.approx(asyncio.run(ai.analyze_sentiment(text)))
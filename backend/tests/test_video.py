@@ -0,0 +1,64 @@
+import asyncio
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from app.services.video import VideoProcessor
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+
+def _make_media(path: str, video: bool = True, audio: bool = True):
+    """Two-second test clip with the requested streams."""
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+    if video:
+        cmd += ["-f", "lavfi", "-i", "testsrc=size=320x240:rate=10:duration=2"]
+    if audio:
+        cmd += ["-f", "lavfi", "-i", "sine=frequency=440:duration=2"]
+    subprocess.run(cmd + ["-y", path], check=True)
+
+
+@pytest.fixture
+def media(tmp_path):
+    def make(video=True, audio=True):
+        path = str(tmp_path / f"clip-{video:d}{audio:d}.mkv")
+        _make_media(path, video=video, audio=audio)
+        return path
+    return make
+
+
+def test_process_media_video_and_audio(media):
+    result = asyncio.run(VideoProcessor.process_media(media(), timestamp=0.5))
+    assert result["thumbnail_path"] is not None
+    assert os.path.getsize(result["thumbnail_path"]) > 0
+    assert len(result["audio"]) == pytest.approx(2 * 16000, rel=0.05)
+    assert result["duration"] == pytest.approx(2, abs=0.1)
+    os.remove(result["thumbnail_path"])
+
+
+def test_process_media_without_audio(media):
+    result = asyncio.run(VideoProcessor.process_media(media(audio=False), timestamp=0.5))
+    assert result["thumbnail_path"] is not None
+    assert len(result["audio"]) == 0
+    assert result["audio_codec"] is None
+    os.remove(result["thumbnail_path"])
+
+
+def test_process_media_audio_only(media):
+    result = asyncio.run(VideoProcessor.process_media(media(video=False)))
+    assert result["thumbnail_path"] is None
+    assert result["video_codec"] is None
+    assert len(result["audio"]) == pytest.approx(2 * 16000, rel=0.05)
+
+
+def test_extract_audio_pcm_without_audio(media):
+    assert len(asyncio.run(VideoProcessor.extract_audio_pcm(media(audio=False)))) == 0
+
+
+def test_process_media_invalid_file(tmp_path):
+    path = tmp_path / "broken.webm"
+    path.write_bytes(b"not a video")
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(VideoProcessor.process_media(str(path)))
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.config import settings
+from app.services import warmup
+
+
+class FlakySTT:
+    """Fails the first ``failures`` warmups."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def warmup(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("model download failed")
+
+
+def test_preload_retries_until_ready(monkeypatch):
+    stt = FlakySTT(failures=2)
+    monkeypatch.setattr(warmup, "_models_ready", False)
+    monkeypatch.setattr(warmup, "get_stt", lambda backend=None: stt)
+    monkeypatch.setattr(settings, "PRELOAD_RETRY_SECONDS", 0.01)
+
+    async def run():
+        await asyncio.wait_for(warmup.start_preload(), timeout=5)
+
+    asyncio.run(run())
+    assert stt.calls == 3
+    assert warmup.models_ready()
+
+
+def test_preload_retry_is_cancelled_on_shutdown(monkeypatch):
+    stt = FlakySTT(failures=1000)
+    monkeypatch.setattr(warmup, "_models_ready", False)
+    monkeypatch.setattr(warmup, "get_stt", lambda backend=None: stt)
+    monkeypatch.setattr(settings, "PRELOAD_RETRY_SECONDS", 0.01)
+
+    async def run():
+        task = warmup.start_preload()
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return task
+
+    assert asyncio.run(run()).cancelled()
+    assert not warmup.models_ready()
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app import worker
+from app.config import settings
+from app.models.entry import Entry
+from app.models.job import ProcessingJob
+from app.models.transcript import TranscriptSegment
+from app.models.user import User
+from app.services.queue import JobQueue, JobLostError
+
+
+@pytest.fixture
+def claimed_job(db, monkeypatch):
+    # Heartbeat every 0.1 s
+    monkeypatch.setattr(settings, "JOB_VISIBILITY_TIMEOUT_SECONDS", 0.3)
+    user = User(email="worker@example.com", username="worker", hashed_password="x")
+    db.add(user)
+    db.flush()
+    entry = Entry(user_id=user.id, video_key="entries/1/video.webm")
+    db.add(entry)
+    db.flush()
+    queue = JobQueue(db)
+    queue.enqueue(entry.id)
+    db.commit()
+    return queue.claim("worker-a")
+
+
+def test_stage_keeps_job_alive_while_running(claimed_job, db):
+    async def slow_stage(ctx):
+        await asyncio.sleep(0.5)
+        return "done"
+
+    assert asyncio.run(worker.run_stage(slow_stage, None, claimed_job.id, "worker-a")) == "done"
+    db.expire_all()
+    # Extended past the original 0.3 s timeout by the heartbeats
+    assert db.get(ProcessingJob, claimed_job.id).locked_until > datetime.utcnow()
+
+
+def test_stage_is_cancelled_when_job_is_lost(claimed_job, db):
+    claimed_job.locked_by = "worker-b"
+    db.commit()
+    cancelled = []
+
+    async def slow_stage(ctx):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(JobLostError):
+        asyncio.run(worker.run_stage(slow_stage, None, claimed_job.id, "worker-a"))
+    assert cancelled
+
+
+def test_slow_heartbeat_does_not_stall_the_loop(claimed_job, monkeypatch):
+    def slow_heartbeat(self, job_id, worker_id):
+        time.sleep(0.3)
+
+    monkeypatch.setattr(JobQueue, "heartbeat", slow_heartbeat)
+
+    async def ticking_stage(ctx):
+        # Longest gap between 10 ms ticks while heartbeats run
+        gaps = []
+        last = time.monotonic()
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            gaps.append(time.monotonic() - last)
+            last = time.monotonic()
+        return max(gaps)
+
+    assert asyncio.run(worker.run_stage(ticking_stage, None, claimed_job.id, "worker-a")) < 0.15
+
+
+class DuplicateStartSTT:
+    """Whisper output with two segments starting at the same offset."""
+
+    async def transcribe(self, audio, language="tr"):
+        return {
+            "text": "merhaba dünya",
+            "segments": [
+                {"start": 0.0, "end": 0.0, "text": "merhaba"},
+                {"start": 0.0, "end": 1.5, "text": "dünya"},
+                {"start": 1.5, "end": 2.0, "text": "nasılsın"},
+            ],
+            "language": language,
+        }
+
+
+def test_transcribe_skips_duplicate_segment_starts(claimed_job, db, monkeypatch):
+    monkeypatch.setattr(worker, "get_stt", lambda: DuplicateStartSTT())
+    entry = db.get(Entry, claimed_job.entry_id)
+    ctx = worker.JobContext(entry, db, db.commit)
+    ctx.audio = np.zeros(2 * worker.SAMPLE_RATE, dtype=np.float32)
+
+    asyncio.run(worker.stage_transcribe(ctx))
+    db.commit()
+
+    starts = db.query(TranscriptSegment.start_seconds).filter(
+        TranscriptSegment.entry_id == entry.id
+    ).order_by(TranscriptSegment.start_seconds).all()
+    assert [start for (start,) in starts] == [0.0, 1.5]
+    assert entry.transcript == "merhaba nasılsın"